@@ -1,2 +1,3 @@
-for ie in range (23,5,-2):
-  print(ie)
+from genesis.emit_range import emit
+
+emit(23, 5, -2)
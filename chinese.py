@@ -1,5 +1,4 @@
-chinese = "伟大的".encode("utf-16")
-print(chinese.decode("utf-16"))
+r'''
 Real Python
 Start Here
  Learn Python 
@@ -746,4 +745,9 @@ Unicode in Python: Working With Character Encodings
 Remove ads
 © 2012–2022 Real Python ⋅ Newsletter ⋅ Podcast ⋅ YouTube ⋅ Twitter ⋅ Facebook ⋅ Instagram ⋅ Python Tutorials ⋅ Search ⋅ Privacy Policy ⋅ Energy Policy ⋅ Advertise ⋅ Contact
 ❤️ Happy Pythoning!
+'''
 
+
+if __name__ == "__main__":
+  chinese = "伟大的".encode("utf-16")
+  print(chinese.decode("utf-16"))
@@ -1,2 +1,3 @@
-for i in range(100,0,-2):
-  print(i)
+from genesis.emit_range import emit
+
+emit(100, 0, -2)
@@ -0,0 +1,50 @@
+import sys
+
+# Importing the package loads nothing else: each name below resolves to its
+# submodule on first attribute access (PEP 562), so a short-lived tool pays
+# only for the helpers it touches.
+_EXPORTS = {
+  "baseconv": ("format_ints", "parse_ints"),
+  "bitseq": ("bitseq_size", "bitseq_to_packed", "decode_file", "encode_file", "iter_bitseq", "iter_unbitseq",
+             "make_bitseq", "make_bitseq_bulk", "make_bitseq_encoded", "pack_bits", "packed_to_bitseq",
+             "parse_bitseq", "unpack_bits"),
+  "codec_cache": ("decode_all", "encode_all", "preferred_encoding"),
+  "detect": ("Detection", "detect_encoding"),
+  "emit_range": ("emit", "iter_blocks"),
+  "emit_shards": ("emit_to_files", "emit_to_mmap", "shard_ranges", "text_size"),
+  "enclen": ("encoded_length", "encoded_lengths"),
+  "firstclass_codec": ("deobfuscate", "obfuscate"),
+  "nbits": ("n_bits_required", "n_bits_required_batch", "n_possible_values", "n_possible_values_batch"),
+  "normalize": ("normalize_batch",),
+  "recover": ("RecoveringDecoder", "Repair", "decode_chunks"),
+  "seqview": ("ArithmeticSequence",),
+  "transcode": ("transcode_file", "transcoded_size"),
+  "ucd_index": ("UnicodeIndex", "get_index"),
+  "ucd_tables": ("categories", "category_codes", "east_asian_widths", "utf8_lengths", "width_codes"),
+  "uchr": ("UchrError", "make_uchr", "parse_uchr", "parse_uchr_codepoints"),
+  "utf8index": ("Utf8Index",),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def _load(module: str):
+  # importlib and typing each cost more than this whole package, so neither
+  # is imported here.
+  __import__(f"{__name__}.{module}")
+  return sys.modules[f"{__name__}.{module}"]
+
+
+def __getattr__(name: str):
+  if name in _EXPORTS:
+    return _load(name)
+  if name not in _MODULES:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  value = getattr(_load(_MODULES[name]), name)
+  globals()[name] = value
+  return value
+
+
+def __dir__() -> list:
+  return sorted(set(globals()) | set(_MODULES) | set(_EXPORTS))
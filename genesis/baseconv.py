@@ -0,0 +1,113 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from itertools import repeat
+
+from . import metrics
+
+_PREFIXES = {2: ("0b", "0B"), 8: ("0o", "0O"), 16: ("0x", "0X")}
+_SPECS = {2: "b", 8: "o", 10: "d", 16: "x"}
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _strip_prefixes(strings: Sequence[str], base: int) -> Sequence[str]:
+  prefixes = _PREFIXES.get(base, ())
+  if prefixes:
+    # The prefix letter is never a digit of its own base, so a column that
+    # lacks it anywhere has no prefixes to strip.
+    joined = "".join(strings)
+    for prefix in prefixes:
+      if prefix[1] in joined:
+        strings = list(map(str.removeprefix, strings, repeat(prefix)))
+  return strings
+
+
+def _parse_joined(strings: Sequence[str], base: int, typecode: str) -> array:
+  # For bases 2 and 16 every entry is zero-filled to the array's item width,
+  # so the digits of the joined column map straight onto the item bytes:
+  # bytes.fromhex for hex, and one linear-time int() call for binary.
+  size = array(typecode).itemsize
+  digits = size * 8 if base == 2 else size * 2
+  joined = "".join(map(str.zfill, strings, repeat(digits)))
+  if len(joined) != digits * len(strings) or not joined.isascii():
+    raise ValueError("entries need the slow path")
+  if base == 16:
+    raw = bytes.fromhex(joined)
+  else:
+    bits = joined.encode("ascii")
+    if bits.translate(None, b"01"):
+      raise ValueError("entries need the slow path")
+    raw = int(bits, 2).to_bytes(size * len(strings), "big")
+  # fromhex skips whitespace, so a stray space shows up as a short result.
+  if len(raw) != size * len(strings):
+    raise ValueError("entries need the slow path")
+  items = array(typecode)
+  items.frombytes(raw)
+  if sys.byteorder == "little":
+    items.byteswap()
+  return items
+
+
+def parse_ints(strings: Sequence[str], base: int = 10, typecode: str = "Q") -> tuple[array, list[int]]:
+  strings = _strip_prefixes(strings, base)
+  # zfill would pad an empty entry (or a bare prefix) into a valid zero, so
+  # such a column goes to int(), which rejects it as for any other base.
+  if strings and base in (2, 16) and typecode.isupper() and all(strings):
+    try:
+      return _parse_joined(strings, base, typecode), []
+    except ValueError:
+      pass
+  try:
+    return array(typecode, map(int, strings, repeat(base))), []
+  except (ValueError, OverflowError):
+    pass
+  # Something in the column is bad: convert entry by entry, leaving 0 at
+  # each malformed or out-of-range index and reporting those indices.
+  if metrics.ENABLED:
+    metrics.count("baseconv.slow_path")
+  items = array(typecode, bytes(array(typecode).itemsize * len(strings)))
+  bad = []
+  for i, s in enumerate(strings):
+    try:
+      items[i] = int(s, base)
+    except (ValueError, OverflowError):
+      bad.append(i)
+  if bad and metrics.ENABLED:
+    metrics.count("baseconv.errors", len(bad))
+  return items, bad
+
+
+def format_ints(values: Sequence[int], base: int = 2, width: int = 8, prefix: bool = False) -> list[str]:
+  if base not in _SPECS:
+    raise ValueError(f"base must be one of {sorted(_SPECS)}, got {base}")
+  limit = base ** width
+  if values and (min(values) < 0 or max(values) >= limit):
+    bad = [i for i, v in enumerate(values) if not 0 <= v < limit]
+    raise ValueError(f"values at indices {bad} do not fit {width} base-{base} digits")
+  strings = list(map(format, values, repeat(f"0{width}{_SPECS[base]}")))
+  if prefix and base in _PREFIXES:
+    strings = list(map(_PREFIXES[base][0].__add__, strings))
+  return strings
+
+
+if __name__ == "__main__":
+  import random
+  import timeit
+
+  assert parse_ints(["11", "0b11", "101"], 2) == (array("Q", [3, 3, 5]), [])
+  assert parse_ints(["11", "0o11"], 8) == (array("Q", [9, 9]), [])
+  assert parse_ints(["11", "0x11", "FfFf"], 16) == (array("Q", [17, 17, 65535]), [])
+  assert parse_ints(["z", "10"], 36) == (array("Q", [35, 36]), [])
+  assert parse_ints(["1f", "xyz", "", "f" * 17, "0x10"], 16) == (array("Q", [31, 0, 0, 0, 16]), [1, 2, 3])
+  assert parse_ints(["-5", "7"], 10, "q") == (array("q", [-5, 7]), [])
+  assert format_ints([0xc3, 0xb1]) == ["11000011", "10110001"]
+  assert format_ints([255, 1], 16, 4, prefix=True) == ["0x00ff", "0x0001"]
+
+  rng = random.Random(0)
+  values = [rng.getrandbits(64) for _ in range(500000)]
+  for base, spec in ((2, "064b"), (16, "x")):
+    column = [format(v, spec) for v in values]
+    assert parse_ints(column, base) == (array("Q", values), [])
+    old = min(timeit.repeat(lambda: array("Q", [int(s, base) for s in column]), number=1, repeat=3))
+    new = min(timeit.repeat(lambda: parse_ints(column, base), number=1, repeat=3))
+    print(f"{len(column)} base-{base} strings: int() loop {old:.4f}s, parse_ints {new:.4f}s ({old / new:.1f}x)")
@@ -0,0 +1,167 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from collections.abc import Callable, Sequence
+
+from . import bitseq, detect, emit_range, enclen, firstclass_codec, nbits, normalize, uchr, ucd_tables
+
+SEED = 0
+SIZES = (1 << 10, 1 << 14, 1 << 18)
+THRESHOLD = 0.10
+BASELINE_PATH = "bench_baseline.json"
+
+_RANGES = {
+  "ascii": [(0x20, 0x7E)],
+  "latin1": [(0x20, 0x7E), (0xA0, 0xFF)],
+  "cjk": [(0x4E00, 0x9FFF), (0x3000, 0x3002)],
+  "emoji": [(0x1F300, 0x1F5FF), (0x1F900, 0x1F9FF)],
+}
+KINDS = ("ascii", "latin1", "cjk", "emoji", "mixed")
+
+
+# prepare turns a corpus into run's arguments; kinds are the corpora it takes.
+Entry = namedtuple("Entry", ("prepare", "run", "kinds"), defaults=(KINDS,))
+
+
+ENTRIES: dict[str, Entry] = {
+  "make_bitseq": Entry(lambda s: (s,), bitseq.make_bitseq, ("ascii",)),
+  "make_bitseq_bulk": Entry(lambda s: (s.encode("utf-8"),), bitseq.make_bitseq_bulk),
+  "make_bitseq_encoded": Entry(lambda s: (s,), bitseq.make_bitseq_encoded),
+  "parse_bitseq": Entry(lambda s: (bitseq.make_bitseq_bulk(s.encode("utf-8")),), bitseq.parse_bitseq),
+  "n_bits_required": Entry(lambda s: (list(map(ord, s)),), lambda values: list(map(nbits.n_bits_required, values))),
+  "n_bits_required_batch": Entry(lambda s: (list(map(ord, s)),), nbits.n_bits_required_batch),
+  "make_uchr": Entry(lambda s: ([f"U+{ord(ch):04X}" for ch in s],), lambda codes: list(map(uchr.make_uchr, codes))),
+  "parse_uchr": Entry(lambda s: (" ".join(f"U+{ord(ch):04X}" for ch in s),), uchr.parse_uchr),
+  "firstclass_encode": Entry(lambda s: (s,), firstclass_codec.obfuscate),
+  "firstclass_decode": Entry(lambda s: (firstclass_codec.obfuscate(s),), firstclass_codec.deobfuscate),
+  "emit_range": Entry(lambda s: (len(s),), lambda n: sum(map(len, emit_range.iter_blocks(n, 0, -1))), ("ascii",)),
+  "detect_encoding": Entry(lambda s: (s.encode("utf-8"),), detect.detect_encoding),
+  "encoded_length": Entry(lambda s: (s, "utf-16"), enclen.encoded_length),
+  "normalize": Entry(lambda s: (s, "NFKC"), normalize.normalize),
+  "categories": Entry(lambda s: (s,), ucd_tables.category_codes),
+}
+
+
+def corpus(kind: str, size: int, seed: int = SEED) -> str:
+  # Deterministic for a given (kind, size, seed), so runs on different days
+  # and machines time the same input. "mixed" draws each character's class
+  # first, weighted towards ASCII the way real text is.
+  rng = random.Random(f"{seed}:{kind}:{size}")
+  if kind == "mixed":
+    kinds = rng.choices(KINDS[:-1], weights=(70, 10, 15, 5), k=size)
+    return "".join(chr(rng.randint(*rng.choice(_RANGES[k]))) for k in kinds)
+  ranges = _RANGES[kind]
+  return "".join(chr(rng.randint(*rng.choice(ranges))) for _ in range(size))
+
+
+def _percentile(samples: Sequence[float], q: float) -> float:
+  return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def measure(entry: Entry, text: str, min_time: float = 0.2, min_runs: int = 5, max_runs: int = 1000) -> dict[str, float]:
+  args = entry.prepare(text)
+  nbytes = len(text.encode("utf-8"))
+  samples: list[float] = []
+  clock = time.perf_counter
+  deadline = clock() + min_time
+  while len(samples) < min_runs or (clock() < deadline and len(samples) < max_runs):
+    start = clock()
+    entry.run(*args)
+    samples.append(clock() - start)
+  samples.sort()
+  # tracemalloc slows allocation-heavy code several-fold, so peak memory gets
+  # its own run instead of skewing the timed ones.
+  tracemalloc.start()
+  entry.run(*args)
+  peak = tracemalloc.get_traced_memory()[1]
+  tracemalloc.stop()
+  median = _percentile(samples, 0.5)
+  return {
+    "runs": len(samples),
+    "mb_per_s": nbytes / median / 1e6 if median else float("inf"),
+    "p50_ms": median * 1e3,
+    "p90_ms": _percentile(samples, 0.9) * 1e3,
+    "p99_ms": _percentile(samples, 0.99) * 1e3,
+    "peak_kib": peak / 1024,
+  }
+
+
+def run(entries: Sequence[str] = tuple(ENTRIES), kinds: Sequence[str] = KINDS, sizes: Sequence[int] = SIZES,
+        seed: int = SEED, min_time: float = 0.2, log: Callable[[str], None] | None = None) -> dict:
+  results = {}
+  for name in entries:
+    entry = ENTRIES[name]
+    for kind in kinds:
+      if kind not in entry.kinds:
+        continue
+      for size in sizes:
+        key = f"{name}/{kind}/{size}"
+        results[key] = measure(entry, corpus(kind, size, seed), min_time)
+        if log:
+          r = results[key]
+          log(f"{key:40} {r['mb_per_s']:9.2f} MB/s  p50 {r['p50_ms']:8.3f} ms  p99 {r['p99_ms']:8.3f} ms  "
+              f"peak {r['peak_kib']:9.1f} KiB")
+  return {
+    "python": platform.python_version(),
+    "implementation": platform.python_implementation(),
+    "machine": platform.machine(),
+    "seed": seed,
+    "results": results,
+  }
+
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD) -> list[str]:
+  # Throughput and peak memory decide; p99 on a shared machine is too noisy
+  # to fail a build on. Keys missing from either side are skipped.
+  regressions = []
+  for key, new in current["results"].items():
+    old = baseline["results"].get(key)
+    if old is None:
+      continue
+    if new["mb_per_s"] < old["mb_per_s"] * (1 - threshold):
+      regressions.append(f"{key}: throughput {old['mb_per_s']:.2f} -> {new['mb_per_s']:.2f} MB/s")
+    if new["peak_kib"] > old["peak_kib"] * (1 + threshold) + 4:
+      regressions.append(f"{key}: peak memory {old['peak_kib']:.1f} -> {new['peak_kib']:.1f} KiB")
+  return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+  parser = argparse.ArgumentParser(description="Benchmark the genesis helpers on fixed-seed corpora.")
+  parser.add_argument("--entries", nargs="+", choices=sorted(ENTRIES), default=list(ENTRIES))
+  parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+  parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="corpus sizes in characters")
+  parser.add_argument("--seed", type=int, default=SEED)
+  parser.add_argument("--min-time", type=float, default=0.2, help="seconds to keep timing each case")
+  parser.add_argument("--output", help="write results as JSON to this path")
+  parser.add_argument("--baseline", default=BASELINE_PATH, help="compare against this JSON if it exists")
+  parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+  parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed fractional regression")
+  args = parser.parse_args(argv)
+  current = run(args.entries, args.kinds, args.sizes, args.seed, args.min_time, log=print)
+  if args.output:
+    with open(args.output, "w") as f:
+      json.dump(current, f, indent=1, sort_keys=True)
+  if args.save_baseline:
+    with open(args.baseline, "w") as f:
+      json.dump(current, f, indent=1, sort_keys=True)
+    return
+  try:
+    with open(args.baseline) as f:
+      baseline = json.load(f)
+  except FileNotFoundError:
+    print(f"no baseline at {args.baseline}; run with --save-baseline to store one")
+    return
+  regressions = compare(current, baseline, args.threshold)
+  if regressions:
+    print("\n".join(regressions))
+    sys.exit(f"{len(regressions)} regressions past {args.threshold:.0%}")
+  print(f"no regressions past {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+  main()
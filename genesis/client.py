@@ -0,0 +1,146 @@
+import asyncio
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+
+from .detect import Detection
+from .server import _FRAME, _HEAD, _LENGTH, DATA, END, ERROR, OPS, write_chunks
+from .uchr import UchrError
+
+Payload = bytes | Iterable[bytes] | AsyncIterable[bytes]
+
+
+class RemoteError(Exception):
+  pass
+
+
+class Client:
+  # Connections are opened on demand up to size and handed back to an idle
+  # list after each complete response, so a burst of requests reuses a few
+  # sockets instead of connecting per call.
+  def __init__(self, path: str | None = None, host: str = "127.0.0.1", port: int = 8765, size: int = 4):
+    self.path, self.host, self.port = path, host, port
+    self._slots = asyncio.Semaphore(size)
+    self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+  async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    while self._idle:
+      reader, writer = self._idle.pop()
+      if not writer.is_closing() and not reader.at_eof():
+        return reader, writer
+      writer.close()
+    if self.path:
+      return await asyncio.open_unix_connection(self.path)
+    return await asyncio.open_connection(self.host, self.port)
+
+  async def _send(self, writer: asyncio.StreamWriter, op: str, payload: Payload, options: dict) -> None:
+    encoded = json.dumps(options).encode("utf-8") if options else b""
+    writer.write(_HEAD.pack(OPS.index(op), len(encoded)) + encoded)
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+      await write_chunks(writer, payload, None)
+    elif hasattr(payload, "__aiter__"):
+      async for chunk in payload:
+        await write_chunks(writer, chunk, None)
+    else:
+      for chunk in payload:
+        await write_chunks(writer, chunk, None)
+    writer.write(_LENGTH.pack(0))
+    await writer.drain()
+
+  async def stream(self, op: str, payload: Payload = b"", **options) -> AsyncIterator[bytes]:
+    async with self._slots:
+      reader, writer = await self._connect()
+      # The payload goes out from its own task while the response is read
+      # here, so a large streamed reply cannot deadlock against a large
+      # request with both sides blocked in drain().
+      sender = asyncio.ensure_future(self._send(writer, op, payload, options))
+      done = False
+      try:
+        while True:
+          kind, n = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+          data = await reader.readexactly(n) if n else b""
+          if kind == DATA:
+            yield data
+          elif kind == END:
+            break
+          elif kind == ERROR:
+            await sender
+            done = True
+            raise RemoteError(data.decode("utf-8", "replace"))
+          else:
+            raise RemoteError(f"unknown frame kind {kind}")
+        await sender
+        done = True
+      finally:
+        if done:
+          self._idle.append((reader, writer))
+        else:
+          sender.cancel()
+          writer.close()
+
+  async def request(self, op: str, payload: Payload = b"", **options) -> bytes:
+    return b"".join([chunk async for chunk in self.stream(op, payload, **options)])
+
+  async def transcode(self, payload: Payload, src: str = "utf-8", dst: str = "utf-8", errors: str = "strict") -> bytes:
+    return await self.request("transcode", payload, src=src, dst=dst, errors=errors)
+
+  async def detect(self, payload: Payload) -> Detection:
+    return Detection(**json.loads(await self.request("detect", payload)))
+
+  async def bitseq(self, payload: Payload) -> bytes:
+    return await self.request("bitseq", payload)
+
+  async def parse_uchr(self, payload: str | Payload) -> tuple[str, list[UchrError]]:
+    if isinstance(payload, str):
+      payload = payload.encode("latin-1")
+    result = json.loads(await self.request("uchr", payload))
+    return result["text"], [UchrError(**e) for e in result["errors"]]
+
+  async def close(self) -> None:
+    while self._idle:
+      _, writer = self._idle.pop()
+      writer.close()
+      await writer.wait_closed()
+
+  async def __aenter__(self) -> "Client":
+    return self
+
+  async def __aexit__(self, *exc) -> None:
+    await self.close()
+
+
+if __name__ == "__main__":
+  import os
+  import tempfile
+
+  from . import bitseq
+  from .server import Server
+
+  async def _check() -> None:
+    text = "記者 鄭啟源 羅智堅 résumé El Niño 🤨 " * 50000
+    data = text.encode("utf-8")
+    with tempfile.TemporaryDirectory() as tmp:
+      server = await Server(os.path.join(tmp, "genesis.sock"), workers=0).start()
+      try:
+        async with Client(server.path, size=2) as client:
+          assert await client.transcode(data, "utf-8", "utf-16-le") == text.encode("utf-16-le")
+          pieces = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+          assert await client.transcode(pieces, "utf-8", "utf-32-be") == text.encode("utf-32-be")
+          assert (await client.detect(text.encode("utf-16-le"))).encoding == "utf-16-le"
+          bits = await client.bitseq(data)
+          assert bits == bitseq.make_bitseq_bulk(data)
+          assert await client.parse_uchr("U+0041 U+D800 U+1F928") == (
+            "A🤨", [UchrError(1, 8, "U+D800", "surrogate code point")])
+          try:
+            await client.transcode(b"\xff", "utf-8")
+          except RemoteError as e:
+            assert "UnicodeDecodeError" in str(e)
+          else:
+            raise AssertionError("bad UTF-8 was accepted")
+          results = await asyncio.gather(*(client.transcode(b"x" * n, dst="utf-16-be") for n in range(50)))
+          assert results == ["x".encode("utf-16-be") * n for n in range(50)]
+          assert len(client._idle) <= 2
+      finally:
+        await server.close()
+
+  asyncio.run(_check())
+  print("ok")
@@ -0,0 +1,129 @@
+import codecs
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
+
+# Codecs implemented in C, for which str.encode and bytes.decode beat any
+# Python-level binding.
+_NATIVE = frozenset(("ascii", "iso8859-1", "utf-8", "utf-16", "utf-16-be", "utf-16-le", "utf-32", "utf-32-be",
+                     "utf-32-le"))
+_first = itemgetter(0)
+_preferred: str | None = None
+
+
+@lru_cache(maxsize=None)
+def lookup(encoding: str) -> codecs.CodecInfo:
+  # Keyed on the name as spelled by the caller, so "UTF8", "utf_8" and
+  # "utf-8" each pay the alias normalization and registry search once.
+  return codecs.lookup(encoding)
+
+
+def canonical(encoding: str) -> str:
+  return lookup(encoding).name
+
+
+def incremental_encoder(encoding: str, errors: str = "strict") -> codecs.IncrementalEncoder:
+  return lookup(encoding).incrementalencoder(errors)
+
+
+def incremental_decoder(encoding: str, errors: str = "strict") -> codecs.IncrementalDecoder:
+  return lookup(encoding).incrementaldecoder(errors)
+
+
+@lru_cache(maxsize=None)
+def encoder(encoding: str, errors: str = "strict") -> Callable[[str], bytes]:
+  # str.encode() resolves its encoding argument on every call. For the codecs
+  # CPython implements in C that is cheap, so the method is kept; anything
+  # else (charmap and escape codecs) is faster through the codec's own encode
+  # function, called directly.
+  name = canonical(encoding)
+  if name in _NATIVE:
+    def bound(s: str) -> bytes:
+      return s.encode(name, errors)
+  else:
+    encode = lookup(encoding).encode
+
+    def bound(s: str) -> bytes:
+      return encode(s, errors)[0]
+
+  return bound
+
+
+@lru_cache(maxsize=None)
+def decoder(encoding: str, errors: str = "strict") -> Callable[[bytes], str]:
+  name = canonical(encoding)
+  if name in _NATIVE:
+    def bound(data: bytes) -> str:
+      return str(data, name, errors)
+  else:
+    decode = lookup(encoding).decode
+
+    def bound(data: bytes) -> str:
+      return decode(data, errors)[0]
+
+  return bound
+
+
+def encode_all(strings: Iterable[str], encoding: str, errors: str = "strict") -> list[bytes]:
+  name = canonical(encoding)
+  if name in _NATIVE:
+    return list(map(str.encode, strings, repeat(name), repeat(errors)))
+  return list(map(_first, map(lookup(encoding).encode, strings, repeat(errors))))
+
+
+def decode_all(items: Iterable[bytes], encoding: str, errors: str = "strict") -> list[str]:
+  name = canonical(encoding)
+  if name in _NATIVE:
+    return list(map(str, items, repeat(name), repeat(errors)))
+  return list(map(_first, map(lookup(encoding).decode, items, repeat(errors))))
+
+
+def preferred_encoding() -> str:
+  # locale.getpreferredencoding() queries the C locale on every call; the
+  # first answer is kept until invalidate(), e.g. after setlocale().
+  global _preferred
+  if _preferred is None:
+    import locale
+
+    _preferred = canonical(locale.getpreferredencoding(False))
+  return _preferred
+
+
+def invalidate() -> None:
+  # For after codecs.register() or a locale change: later calls resolve
+  # names afresh. Callables handed out earlier keep their old codec.
+  global _preferred
+  _preferred = None
+  lookup.cache_clear()
+  encoder.cache_clear()
+  decoder.cache_clear()
+
+
+if __name__ == "__main__":
+  import locale
+  import timeit
+
+  assert canonical("UTF8") == canonical("utf_8") == "utf-8" and canonical("latin-1") == "iso8859-1"
+  assert lookup("utf-16") is lookup("utf-16")
+  assert preferred_encoding() == codecs.lookup(locale.getpreferredencoding(False)).name
+  assert encoder("cp1252")("¼ cup") == "¼ cup".encode("cp1252")
+  assert decoder("utf-16")("é".encode("utf-16")) == "é"
+  enc = incremental_encoder("utf-16")
+  assert enc.encode("a") + enc.encode("b", True) == "ab".encode("utf-16")
+  assert decode_all(encode_all(["a", "é"], "unicode-escape"), "unicode-escape") == ["a", "é"]
+  assert decode_all([b"\xe9"], "latin-1") == ["é"] and decoder("utf-8", "replace")(b"\xff") == "\ufffd"
+
+  records = ["記者 鄭啟源 羅智堅", "résumé", "El Niño", "¼ cup of flour", "shrimp and grits"] * 40000
+  for name, errors in (("utf-8", "strict"), ("latin-1", "replace"), ("utf-16", "strict"), ("cp1252", "replace"),
+                       ("unicode-escape", "strict")):
+    old = min(timeit.repeat(lambda: [s.encode(name, errors) for s in records], number=1, repeat=3))
+    bound = encoder(name, errors)
+    new = min(timeit.repeat(lambda: list(map(bound, records)), number=1, repeat=3))
+    batch = min(timeit.repeat(lambda: encode_all(records, name, errors), number=1, repeat=3))
+    assert encode_all(records, name, errors) == [s.encode(name, errors) for s in records]
+    print(f"{len(records)} records to {name}: str.encode {old:.4f}s, bound {new:.4f}s ({old / new:.1f}x), "
+          f"encode_all {batch:.4f}s ({old / batch:.1f}x)")
+  old = min(timeit.repeat(lambda: locale.getpreferredencoding(False), number=10000, repeat=3))
+  new = min(timeit.repeat(preferred_encoding, number=10000, repeat=3))
+  print(f"preferred encoding x10000: locale {old:.4f}s, snapshot {new:.4f}s ({old / new:.0f}x)")
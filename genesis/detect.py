@@ -0,0 +1,110 @@
+import codecs
+from collections import namedtuple
+from io import BufferedIOBase
+
+from . import metrics
+from .codec_cache import incremental_decoder
+
+SAMPLE_SIZE = 64 * 1024
+
+# Longest BOM first: the UTF-32-LE BOM starts with the UTF-16-LE one.
+_BOMS = [
+  (codecs.BOM_UTF32_LE, "utf-32"),
+  (codecs.BOM_UTF32_BE, "utf-32"),
+  (codecs.BOM_UTF8, "utf-8-sig"),
+  (codecs.BOM_UTF16_LE, "utf-16"),
+  (codecs.BOM_UTF16_BE, "utf-16"),
+]
+# Bytes 0x80-0x9f that cp1252 maps to printable characters; the other five
+# are unassigned there, and their presence points to latin-1 instead.
+_CP1252_ONLY = bytes(b for b in range(0x80, 0xA0) if b not in (0x81, 0x8D, 0x8F, 0x90, 0x9D))
+_NOT_C1 = bytes(b for b in range(256) if not 0x80 <= b < 0xA0)
+
+
+Detection = namedtuple("Detection", ("encoding", "confidence"))
+
+
+def _decodes(sample: bytes, encoding: str, truncated: bool) -> bool:
+  # An incremental decoder lets a sample cut mid-sequence still validate.
+  try:
+    incremental_decoder(encoding).decode(sample, final=not truncated)
+  except UnicodeDecodeError:
+    return False
+  return True
+
+
+def _wide(sample: bytes, truncated: bool) -> Detection | None:
+  n = len(sample)
+  if n < 4 or not sample.count(0):
+    return None
+  for unit, names in ((4, ("utf-32-le", "utf-32-be")), (2, ("utf-16-le", "utf-16-be"))):
+    columns = [sample[k::unit].count(0) / len(sample[k::unit]) for k in range(unit)]
+    # The top byte of a UTF-32 unit is always zero, and mostly-Latin text
+    # leaves the high byte of most UTF-16 units zero.
+    le, be = columns[-1], columns[0]
+    for score, other, encoding in ((le, columns[0], names[0]), (be, columns[-1], names[1])):
+      if score > 0.6 and other < 0.4 and _decodes(sample[:n - n % unit], encoding, truncated):
+        return Detection(encoding, round(min(score, 0.99), 2))
+  return None
+
+
+def detect_encoding(data: bytes | bytearray | memoryview | BufferedIOBase, sample_size: int = SAMPLE_SIZE) -> Detection:
+  if hasattr(data, "read"):
+    # A seekable stream is put back where it was, so the caller can decode
+    # it from the start; a pipe or socket keeps the sample consumed.
+    start = data.tell() if data.seekable() else None
+    sample = data.read(sample_size + 1)
+    if start is not None:
+      data.seek(start)
+  else:
+    sample = data[:sample_size + 1]
+  sample = bytes(sample)
+  truncated = len(sample) > sample_size
+  sample = sample[:sample_size]
+  for bom, encoding in _BOMS:
+    if sample.startswith(bom):
+      return Detection(encoding, 1.0)
+  wide = _wide(sample, truncated)
+  if wide is not None:
+    return wide
+  if sample.isascii():
+    return Detection("ascii", 1.0)
+  if _decodes(sample, "utf-8", truncated):
+    return Detection("utf-8", 0.99)
+  if metrics.ENABLED:
+    metrics.count("detect.legacy_fallback")
+  c1 = sample.translate(None, _NOT_C1)
+  if c1 and not c1.translate(None, _CP1252_ONLY):
+    return Detection("cp1252", 0.6)
+  return Detection("latin-1", 0.5)
+
+
+if __name__ == "__main__":
+  import io
+  import time
+
+  text = "記者 鄭啟源 羅智堅 résumé El Niño 🤨 " * 20000
+  cases = [
+    (b"\xbc cup of flour", "latin-1"),
+    (b"\x93smart quotes\x94", "cp1252"),
+    ("αβγδ".encode("utf-8"), "utf-8"),
+    ("Help me greet ma".encode("utf-16"), "utf-16"),
+    ("Help me greet ma".encode("utf-16-le"), "utf-16-le"),
+    ("Help me greet ma".encode("utf-32-be"), "utf-32-be"),
+    ("🤨🤨".encode("utf-32-le"), "utf-32-le"),
+    (text.encode("utf-8"), "utf-8"),
+    (text.encode("utf-8")[:SAMPLE_SIZE + 1] + b"\xff", "utf-8"),
+    (b"shrimp and grits", "ascii"),
+  ]
+  for data, expected in cases:
+    assert detect_encoding(data).encoding == expected, (data[:20], detect_encoding(data), expected)
+  stream = io.BytesIO(b"hello world")
+  stream.seek(6)
+  assert detect_encoding(stream).encoding == "ascii" and stream.read() == b"world"
+  payloads = [data for data, _ in cases] * 2000
+  total = sum(min(len(data), SAMPLE_SIZE) for data in payloads)
+  start = time.perf_counter()
+  for data in payloads:
+    detect_encoding(data)
+  elapsed = time.perf_counter() - start
+  print(f"{len(payloads) / elapsed:.0f} detections/s, {total / elapsed / 1e6:.0f} MB/s of sampled input")
@@ -0,0 +1,113 @@
+import os
+import sys
+from collections.abc import Iterator
+from functools import lru_cache
+from io import BufferedIOBase
+
+DIGITS = 4
+BLOCK = 10 ** DIGITS
+
+
+def _plain(r: range) -> Iterator[bytes]:
+  for i in range(0, len(r), BLOCK):
+    yield ("\n".join(map(str, r[i:i + BLOCK])) + "\n").encode("ascii")
+
+
+@lru_cache(maxsize=None)
+def _template(step: int, phase: int) -> bytes:
+  # Every line of one BLOCK-aligned run, with "X" standing in for the shared
+  # leading digits; step divides BLOCK, so all full runs use the same lines.
+  suffixes = range(phase, BLOCK, abs(step))
+  return b"".join(b"X%0*d\n" % (DIGITS, s) for s in (suffixes if step > 0 else reversed(suffixes)))
+
+
+def _run_length(value: int, step: int) -> int:
+  # How many values from value onwards, moving by step, share its prefix.
+  prefix = value // BLOCK
+  return len(range(value, (prefix + 1) * BLOCK if step > 0 else prefix * BLOCK - 1, step))
+
+
+def iter_blocks(start: int, stop: int, step: int = 1) -> Iterator[bytes]:
+  r = range(start, stop, step)
+  if not r:
+    return
+  if BLOCK % abs(step):
+    yield from _plain(r)
+    return
+  # Values below BLOCK have fewer digits than the template, so they take the
+  # plain path; they sit at the end of a descending range and the start of
+  # an ascending one.
+  if step < 0:
+    split = len(range(start, max(stop, BLOCK - 1), step))
+    big, small = r[:split], r[split:]
+  else:
+    split = len(range(start, min(stop, BLOCK), step))
+    small, big = r[:split], r[split:]
+  if step > 0:
+    yield from _plain(small)
+  if big:
+    first, last = big[0] // BLOCK, big[-1] // BLOCK
+    direction = 1 if step > 0 else -1
+    head, tail = _run_length(big[0], step), _run_length(big[-1], -step)
+    if first == last:
+      yield from _plain(big)
+    else:
+      yield from _plain(big[:head])
+      template = _template(step, big[0] % abs(step))
+      for prefix in range(first + direction, last, direction):
+        yield template.replace(b"X", b"%d" % prefix)
+      yield from _plain(big[len(big) - tail:])
+  if step < 0:
+    yield from _plain(small)
+
+
+def emit(start: int, stop: int, step: int = 1, out: BufferedIOBase | None = None) -> None:
+  out = sys.stdout.buffer if out is None else out
+  for block in iter_blocks(start, stop, step):
+    out.write(block)
+  out.flush()
+
+
+def _bench() -> None:
+  import contextlib
+  import io
+  import time
+
+  for args in [(100, 0, -2), (23, 5, -2), (55, 11, -1), (0, 123457, 1), (987654, -5, -5), (5, 200003, 8),
+               (-30, 30, 4), (10 ** 5, 10 ** 5 + 10 ** 4, 1), (200000, 9999, -10000), (3, 250000, 7)]:
+    buf = io.BytesIO()
+    emit(*args, out=buf)
+    assert buf.getvalue() == "".join(f"{i}\n" for i in range(*args)).encode("ascii"), args
+  with open(os.devnull, "w") as text_sink, open(os.devnull, "wb") as sink:
+    n = 10 ** 6
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(text_sink):
+      for i in range(n, 0, -1):
+        print(i)
+    old = n / (time.perf_counter() - start)
+    n = 30 * 10 ** 6
+    start = time.perf_counter()
+    emit(n, 0, -1, out=sink)
+    new = n / (time.perf_counter() - start)
+  print(f"print() loop {old / 1e6:.1f}M lines/s, emit {new / 1e6:.1f}M lines/s ({new / old:.0f}x)")
+
+
+def main(argv: list[str] | None = None) -> None:
+  import argparse
+
+  parser = argparse.ArgumentParser(description="Print range(start, stop, step), one number per line.")
+  parser.add_argument("start", type=int, nargs="?")
+  parser.add_argument("stop", type=int, nargs="?")
+  parser.add_argument("step", type=int, nargs="?", default=1)
+  parser.add_argument("--bench", action="store_true", help="check output and measure throughput")
+  args = parser.parse_args(argv)
+  if args.bench:
+    _bench()
+  elif args.stop is None:
+    parser.error("start and stop are required")
+  else:
+    emit(args.start, args.stop, args.step)
+
+
+if __name__ == "__main__":
+  main()
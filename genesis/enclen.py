@@ -0,0 +1,141 @@
+import sys
+from array import array
+from collections.abc import Callable, Iterable
+from itertools import repeat
+from operator import itemgetter
+
+from .codec_cache import canonical, incremental_encoder, lookup
+
+WINDOW = 1 << 16
+
+_BOM = {"utf-16": 2, "utf-32": 4}
+_UTF16 = ("utf-16", "utf-16-le", "utf-16-be")
+_UTF32 = ("utf-32", "utf-32-le", "utf-32-be")
+_ASCII_SUPERSETS = ("utf-8", "ascii", "iso8859-1", "cp1252")
+_NATIVE = ("utf-8", "utf-16", "utf-32", "iso8859-1", "ascii")
+_CODECS: dict[str, tuple[str, Callable | None]] = {}
+_first = itemgetter(0)
+# CPython stores a non-ASCII str as a fixed header plus len + 1 slots of 1, 2
+# or 4 bytes, so sys.getsizeof tells the widest code point class in O(1).
+# A cached UTF-8 copy only makes the estimate wider, which is the safe side.
+_HEADER = sys.getsizeof("\xe9") - 2 if sys.implementation.name == "cpython" else None
+
+
+def _kind(s: str) -> int:
+  if _HEADER is None:
+    return 4
+  return (sys.getsizeof(s) - _HEADER) // (len(s) + 1)
+
+
+def _narrow(s: str) -> bool:
+  return s.isascii() or _kind(s) == 1
+
+
+def _windowed(s: str, encoding: str) -> int:
+  encoder = incremental_encoder(encoding)
+  total = 0
+  for start in range(0, len(s), WINDOW):
+    total += len(encoder.encode(s[start:start + WINDOW], start + WINDOW >= len(s)))
+  return total
+
+
+def _resolve(encoding: str) -> tuple[str, Callable | None]:
+  # str.encode() skips the codec registry only for a few names such as
+  # "utf-8" and "utf-16"; "utf-16-le" and "utf-32-be" pay a lookup per call,
+  # which the codec's own encode function skips. None means str.encode().
+  name = canonical(encoding)
+  _CODECS[encoding] = name, None if name in _NATIVE else lookup(name).encode
+  return _CODECS[encoding]
+
+
+def _large(s: str, encoding: str) -> int:
+  # Only a 1-byte str is sure to hold no lone surrogate, which the UTF-16
+  # and UTF-32 codecs refuse. Wider strings are encoded a window at a time,
+  # which raises as str.encode() does and costs less than any search for
+  # surrogates would.
+  n = len(s)
+  if s.isascii() and encoding in _ASCII_SUPERSETS:
+    return n
+  if _narrow(s):
+    if encoding == "iso8859-1":
+      return n
+    if encoding in _UTF16:
+      return 2 * n + _BOM.get(encoding, 0)
+    if encoding in _UTF32:
+      return 4 * n + _BOM.get(encoding, 0)
+  return _windowed(s, encoding)
+
+
+def encoded_length(s: str, encoding: str = "utf-8") -> int:
+  # A record of up to WINDOW characters is encoded whole: C does that faster
+  # than any per-character count in Python, and the copy is freed at once.
+  # Only longer strings, where the full copy hurts, take the windowed path.
+  name, encode = _CODECS.get(encoding) or _resolve(encoding)
+  if len(s) > WINDOW:
+    return _large(s, name)
+  if encode is None:
+    return len(s.encode(name))
+  return len(encode(s)[0])
+
+
+def encoded_lengths(strings: Iterable[str], encoding: str = "utf-8") -> array:
+  # Per-record Python calls would cost more than encoding short records, so
+  # the batch form stays in C-level map() chains and only measures lengths
+  # when every record's size follows from len() alone. The width checks stop
+  # at the first record that fails them.
+  encoding, encode = _CODECS.get(encoding) or _resolve(encoding)
+  strings = strings if isinstance(strings, (list, tuple)) else list(strings)
+  if encoding in _ASCII_SUPERSETS and all(map(str.isascii, strings)):
+    lengths = map(len, strings)
+  elif encoding in _UTF16 and all(map(str.isascii, strings)):
+    lengths = map((2).__mul__, map(len, strings))
+  elif encoding in _UTF32 and all(map(_narrow, strings)):
+    lengths = map((4).__mul__, map(len, strings))
+  elif encoding == "utf-8":
+    return array("Q", map(len, map(str.encode, strings)))
+  elif encode is None:
+    return array("Q", map(len, map(str.encode, strings, repeat(encoding))))
+  else:
+    return array("Q", map(len, map(_first, map(encode, strings))))
+  bom = _BOM.get(encoding, 0)
+  return array("Q", map(bom.__add__, lengths) if bom else lengths)
+
+
+if __name__ == "__main__":
+  import timeit
+
+  samples = ["", "bits", "résumé", "El Niño", "🤨", "記者 鄭啟源 羅智堅", "αβγδ" * 50000, "shrimp and grits" * 50000]
+  for encoding in ("utf-8", "utf-16", "utf-16-le", "utf-32", "utf-32-be", "latin-1", "ascii", "utf-8-sig"):
+    for s in samples:
+      try:
+        expected = len(s.encode(encoding))
+      except UnicodeEncodeError:
+        continue
+      assert encoded_length(s, encoding) == expected, (s[:10], encoding)
+  for s in ("a\ud800", "記\udfff", "🤨\ud83e", "\uffff\udc00"):
+    for encoding in ("utf-8", "utf-16", "utf-32-le"):
+      try:
+        encoded_length(s, encoding)
+      except UnicodeEncodeError:
+        pass
+      else:
+        raise AssertionError(f"sized {s!r} in {encoding}")
+  for encoding in ("utf-8", "utf-16", "utf-32", "latin-1"):
+    mixed = [s for s in samples if encoding != "latin-1" or max(s, default="a") < "\u0100"]
+    for records in (mixed, ["bits", "shrimp and grits"]):
+      assert list(encoded_lengths(records, encoding)) == [len(r.encode(encoding)) for r in records]
+
+  def bench(label, old, new):
+    old = min(timeit.repeat(old, number=1, repeat=3))
+    new = min(timeit.repeat(new, number=1, repeat=3))
+    print(f"{label}: encode+len {old:.4f}s, enclen {new:.4f}s ({old / new:.1f}x)")
+
+  for encoding in ("utf-8", "utf-16-le", "utf-32-le"):
+    for kind, records in (("ascii", ["shrimp and grits", "El Nino"] * 500000),
+                          ("mixed", ["shrimp and grits", "El Niño", "記者 鄭啟源 羅智堅", "🤨 ibrow"] * 250000)):
+      bench(f"{len(records)} {kind} records {encoding}",
+            lambda: array("Q", [len(r.encode(encoding)) for r in records]),
+            lambda: encoded_lengths(records, encoding))
+  text = "記者 鄭啟源 羅智堅 αβγδ " * 1000000
+  for encoding in ("utf-8", "utf-16-le", "utf-32-le"):
+    bench(f"{len(text)}-char string {encoding}", lambda: len(text.encode(encoding)), lambda: encoded_length(text, encoding))
@@ -0,0 +1,136 @@
+import os
+import struct
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from io import BufferedIOBase
+
+from .firstclass_codec import deobfuscate, obfuscate
+
+CHUNK_SIZE = 10000
+_LENGTH = struct.Struct(">I")
+
+
+def read_lines(f: BufferedIOBase) -> Iterator[bytes]:
+  for line in f:
+    yield line.rstrip(b"\n")
+
+
+def read_frames(f: BufferedIOBase) -> Iterator[bytes]:
+  while True:
+    header = f.read(_LENGTH.size)
+    if not header:
+      return
+    if len(header) < _LENGTH.size:
+      raise ValueError("truncated length prefix")
+    (size,) = _LENGTH.unpack(header)
+    message = f.read(size)
+    if len(message) < size:
+      raise ValueError("truncated message")
+    yield message
+
+
+def _frame(messages: Iterable[bytes]) -> bytes:
+  return b"".join(_LENGTH.pack(len(m)) + m for m in messages)
+
+
+def process_chunk(messages: list[bytes], mode: str, framing: str) -> bytes:
+  convert = obfuscate if mode == "encode" else deobfuscate
+  if framing == "lines":
+    # Reversing the joined chunk reverses every message and also their
+    # order, so one call handles the whole chunk and a list reversal puts
+    # the messages back in place. Neither direction produces a newline.
+    lines = convert("\n".join(m.decode("utf-8") for m in messages)).split("\n")
+    return "".join(line + "\n" for line in reversed(lines)).encode("utf-8")
+  return _frame(convert(m.decode("utf-8")).encode("utf-8") for m in messages)
+
+
+def _chunks(messages: Iterable[bytes], size: int) -> Iterator[list[bytes]]:
+  chunk = []
+  for message in messages:
+    chunk.append(message)
+    if len(chunk) == size:
+      yield chunk
+      chunk = []
+  if chunk:
+    yield chunk
+
+
+def run(messages: Iterable[bytes], mode: str, framing: str = "lines", workers: int = 0,
+        chunk_size: int = CHUNK_SIZE, executor: "concurrent.futures.Executor | None" = None) -> Iterator[bytes]:
+  if workers <= 0 and executor is None:
+    for chunk in _chunks(messages, chunk_size):
+      yield process_chunk(chunk, mode, framing)
+    return
+  own = executor is None
+  if own:
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+  # A bounded window of in-flight chunks keeps memory flat, and yielding
+  # from the left of the deque keeps output in input order.
+  pending = deque()
+  limit = 2 * (workers or os.cpu_count() or 1)
+  try:
+    for chunk in _chunks(messages, chunk_size):
+      pending.append(executor.submit(process_chunk, chunk, mode, framing))
+      if len(pending) >= limit:
+        yield pending.popleft().result()
+    while pending:
+      yield pending.popleft().result()
+  finally:
+    if own:
+      executor.shutdown(cancel_futures=True)
+
+
+def _bench(count: int, chunk_size: int) -> None:
+  import time
+  from concurrent.futures import ProcessPoolExecutor
+
+  messages = [f"Help me greet ma {i}! @sam".encode("utf-8") for i in range(count)]
+  expected = None
+  for workers in (1, 2, 4, 8):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      # Warm the pool so worker start-up is not part of the measurement.
+      list(executor.map(abs, range(workers)))
+      start = time.perf_counter()
+      out = b"".join(run(messages, "encode", "lines", workers, chunk_size, executor))
+      elapsed = time.perf_counter() - start
+    if expected is None:
+      expected = out
+    assert out == expected
+    print(f"{workers} workers: {count / elapsed:,.0f} messages/s")
+
+
+def main(argv: list[str] | None = None) -> None:
+  import argparse
+
+  parser = argparse.ArgumentParser(description="Encode or decode FirstClass messages in bulk.")
+  parser.add_argument("mode", choices=("encode", "decode", "bench"))
+  parser.add_argument("input", nargs="?", help="input file (default: stdin)")
+  parser.add_argument("output", nargs="?", help="output file (default: stdout)")
+  parser.add_argument("--framing", choices=("lines", "length"), default="lines")
+  parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 runs in-process")
+  parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+  parser.add_argument("--count", type=int, default=2000000, help="messages for bench")
+  args = parser.parse_args(argv)
+  if args.mode == "bench":
+    _bench(args.count, args.chunk_size)
+    return
+  src = open(args.input, "rb") if args.input else sys.stdin.buffer
+  dst = open(args.output, "wb") if args.output else sys.stdout.buffer
+  try:
+    messages = read_lines(src) if args.framing == "lines" else read_frames(src)
+    for block in run(messages, args.mode, args.framing, args.workers, args.chunk_size):
+      dst.write(block)
+  finally:
+    if args.input:
+      src.close()
+    if args.output:
+      dst.close()
+    else:
+      dst.flush()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import subprocess
+import sys
+from collections.abc import Sequence
+
+# For the total, stdlib included. collections and functools, which array and
+# lru_cache need anyway, are about half of it on a slow machine.
+BUDGET_MS = 8.0
+MODULES = ("genesis", "genesis.baseconv", "genesis.bitseq", "genesis.codec_cache", "genesis.detect",
+           "genesis.emit_range", "genesis.emit_shards", "genesis.enclen", "genesis.firstclass_batch",
+           "genesis.firstclass_codec", "genesis.metrics", "genesis.nbits", "genesis.normalize",
+           "genesis.recover", "genesis.seqview", "genesis.transcode", "genesis.ucd_index",
+           "genesis.ucd_tables", "genesis.uchr", "genesis.utf8index")
+
+
+def import_time(module: str, runs: int = 5) -> tuple[float, float]:
+  # Microseconds python -X importtime charges to the module, best of several
+  # fresh interpreters: its own code (self time of every genesis module it
+  # pulls in) and the cumulative total including the stdlib it needs. Bytecode
+  # writing is forced on so that only the first run compiles.
+  env = dict(os.environ)
+  env.pop("PYTHONDONTWRITEBYTECODE", None)
+  own = total = float("inf")
+  for _ in range(runs + 1):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True, env=env)
+    spent = 0
+    for line in proc.stderr.splitlines():
+      fields = line.split("|")
+      if len(fields) != 3:
+        continue
+      name = fields[2].strip()
+      if name.split(".")[0] == "genesis":
+        spent += int(fields[0].rsplit(":", 1)[1])
+      if name == module:
+        total = min(total, int(fields[1]))
+    own = min(own, spent)
+  return own, total
+
+
+def measure(modules: Sequence[str] = MODULES, runs: int = 5) -> dict[str, tuple[float, float]]:
+  return {module: tuple(us / 1000 for us in import_time(module, runs)) for module in modules}
+
+
+def main(argv: list[str] | None = None) -> None:
+  parser = argparse.ArgumentParser(description="Measure cold import time of the genesis modules.")
+  parser.add_argument("modules", nargs="*", default=MODULES)
+  parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module, best one kept")
+  parser.add_argument("--budget", type=float, default=BUDGET_MS,
+                      help="fail if any module's import time, stdlib included, exceeds this (ms)")
+  args = parser.parse_args(argv)
+  over = []
+  print(f"{'module':28} {'own':>10} {'with stdlib':>12}")
+  for module, (own, total) in measure(args.modules, args.runs).items():
+    print(f"{module:28} {own:7.2f} ms {total:9.2f} ms")
+    # A caller pays for the stdlib modules a helper drags in as much as for
+    # its own code, so the total is what the budget holds.
+    if total > args.budget:
+      over.append(module)
+  if over:
+    sys.exit(f"over the {args.budget} ms budget: {', '.join(over)}")
+
+
+if __name__ == "__main__":
+  main()
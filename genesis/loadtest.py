@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from .client import Client, RemoteError
+
+_TEXT = "記者 鄭啟源 羅智堅 résumé El Niño 🤨 shrimp and grits "
+
+
+def _payloads(size: int) -> dict[str, tuple]:
+  text = (_TEXT * (size // len(_TEXT.encode("utf-8")) + 1)).encode("utf-8")[:size]
+  text = text.decode("utf-8", "ignore").encode("utf-8")
+  codes = " ".join(f"U+{ord(ch):04X}" for ch in text.decode("utf-8")[:size // 7 or 1])
+  return {
+    "transcode": ("transcode", text, {"src": "utf-8", "dst": "utf-16-le"}),
+    "detect": ("detect", text, {}),
+    "bitseq": ("bitseq", text, {}),
+    "uchr": ("uchr", codes.encode("ascii"), {}),
+  }
+
+
+def _percentile(samples: list[float], q: float) -> float:
+  return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+
+
+async def _worker(client: Client, requests: list[tuple], deadline: float, latencies: list[float],
+                  errors: list[str]) -> None:
+  clock = time.perf_counter
+  i = 0
+  while clock() < deadline:
+    op, payload, options = requests[i % len(requests)]
+    i += 1
+    start = clock()
+    try:
+      await client.request(op, payload, **options)
+    except (RemoteError, ConnectionError, asyncio.IncompleteReadError) as e:
+      errors.append(f"{op}: {e}")
+      continue
+    latencies.append(clock() - start)
+
+
+async def load(client: Client, ops: list[str], size: int, concurrency: int, duration: float) -> dict[str, float]:
+  payloads = _payloads(size)
+  requests = [payloads[op] for op in ops]
+  latencies: list[float] = []
+  errors: list[str] = []
+  start = time.perf_counter()
+  await asyncio.gather(*(_worker(client, requests[k % len(requests):] + requests[:k % len(requests)],
+                                 start + duration, latencies, errors) for k in range(concurrency)))
+  elapsed = time.perf_counter() - start
+  latencies.sort()
+  return {"requests": len(latencies), "errors": len(errors), "req_per_s": len(latencies) / elapsed,
+          "p50_ms": _percentile(latencies, 0.5) * 1e3, "p99_ms": _percentile(latencies, 0.99) * 1e3,
+          "max_ms": _percentile(latencies, 1.0) * 1e3}
+
+
+def _spawn(path: str, workers: int | None) -> subprocess.Popen:
+  cmd = [sys.executable, "-m", "genesis.server", "--unix", path]
+  if workers is not None:
+    cmd += ["--workers", str(workers)]
+  proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+  proc.stdout.readline()
+  return proc
+
+
+def main(argv: list[str] | None = None) -> None:
+  parser = argparse.ArgumentParser(description="Load-test a genesis server and report req/s and latency.")
+  parser.add_argument("--unix", metavar="PATH", help="server socket; without it or --port a server is started")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int)
+  parser.add_argument("--workers", type=int, help="worker processes for the server this script starts")
+  parser.add_argument("--ops", nargs="+", choices=["transcode", "detect", "bitseq", "uchr"],
+                      default=["transcode", "detect", "bitseq", "uchr"])
+  parser.add_argument("--size", type=int, default=4096, help="payload bytes per request")
+  parser.add_argument("--concurrency", type=int, default=16)
+  parser.add_argument("--connections", type=int, default=8, help="client pool size")
+  parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+  args = parser.parse_args(argv)
+  proc = None
+  with tempfile.TemporaryDirectory() as tmp:
+    path = args.unix
+    if path is None and args.port is None:
+      path = os.path.join(tmp, "genesis.sock")
+      proc = _spawn(path, args.workers)
+    try:
+      async def run() -> dict[str, float]:
+        async with Client(path, args.host, args.port, args.connections) as client:
+          return await load(client, args.ops, args.size, args.concurrency, args.duration)
+
+      r = asyncio.run(run())
+    finally:
+      if proc:
+        proc.terminate()
+        proc.wait()
+  print(f"{' '.join(args.ops)} x {args.size} B, concurrency {args.concurrency}, {args.connections} connections: "
+        f"{r['req_per_s']:.0f} req/s, p50 {r['p50_ms']:.2f} ms, p99 {r['p99_ms']:.2f} ms, max {r['max_ms']:.2f} ms, "
+        f"{r['errors']} errors")
+  if r["errors"]:
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,329 @@
+import functools
+import sys
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+
+# Off by default. While off, every helper is the plain function and the only
+# cost left is an "if metrics.ENABLED" test on rare fallback paths.
+ENABLED = False
+
+# Upper bounds in seconds for the timing histograms, Prometheus style.
+BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+# The helpers enable() swaps for counting wrappers, per genesis submodule.
+# "Class.method" entries are patched on the class.
+INSTRUMENTED = {
+  "baseconv": ("parse_ints", "format_ints"),
+  "bitseq": ("make_bitseq", "make_bitseq_bulk", "make_bitseq_encoded", "pack_bits", "unpack_bits", "parse_bitseq",
+             "encode_file", "decode_file"),
+  "detect": ("detect_encoding",),
+  "emit_range": ("emit",),
+  "enclen": ("encoded_length", "encoded_lengths"),
+  "firstclass_codec": ("obfuscate", "deobfuscate"),
+  "nbits": ("n_bits_required", "n_bits_required_batch", "n_possible_values_batch"),
+  "normalize": ("normalize", "normalize_batch"),
+  "recover": ("RecoveringDecoder.decode",),
+  "transcode": ("transcoded_size", "transcode_file"),
+  "ucd_tables": ("records", "categories", "east_asian_widths", "utf8_lengths"),
+  "uchr": ("make_uchr", "parse_uchr", "parse_uchr_codepoints"),
+}
+
+def _size(obj) -> int:
+  # Characters for str, bytes for anything with the buffer protocol (mmap
+  # included), 0 for file objects and the like. Tuple results such as
+  # parse_uchr's count their first item.
+  if isinstance(obj, tuple) and obj:
+    obj = obj[0]
+  if isinstance(obj, str):
+    return len(obj)
+  try:
+    return memoryview(obj).nbytes
+  except TypeError:
+    return 0
+
+
+def _total(obj) -> int:
+  # A list or tuple of payloads, or a tuple result whose first item is one.
+  # Other iterables are not consumed and count 0.
+  if isinstance(obj, tuple) and obj and isinstance(obj[0], list):
+    obj = obj[0]
+  return sum(map(_size, obj)) if isinstance(obj, (list, tuple)) else 0
+
+
+def _arg(name: str, pos: int = 0, size: Callable = _size) -> Callable:
+  def extract(args: tuple, kwargs: dict) -> int:
+    return size(args[pos] if len(args) > pos else kwargs.get(name))
+
+  return extract
+
+
+def _path_size(args: tuple, kwargs: dict) -> int:
+  import os
+
+  return os.path.getsize(args[0] if args else kwargs["src_path"])
+
+
+def _written(result) -> int:
+  # make_bitseq_bulk into a caller's buffer returns the size it wrote.
+  return result if isinstance(result, int) else _size(result)
+
+
+# Which argument and which result are the payload, for bytes_in and
+# bytes_out. A side that is None, or a helper not listed, has no payload
+# (counts, widths, file objects) and is left out of snapshot() and
+# prometheus() rather than reported as 0.
+PAYLOADS = {
+  "baseconv.parse_ints": (_arg("strings", size=_total), None),
+  "baseconv.format_ints": (None, _total),
+  "bitseq.make_bitseq": (_arg("s"), _size),
+  "bitseq.make_bitseq_bulk": (_arg("data"), _written),
+  "bitseq.make_bitseq_encoded": (_arg("s"), _size),
+  "bitseq.pack_bits": (_arg("data"), _size),
+  "bitseq.unpack_bits": (_arg("packed"), _size),
+  "bitseq.parse_bitseq": (_arg("s"), _size),
+  "detect.detect_encoding": (_arg("data"), None),
+  "enclen.encoded_length": (_arg("s"), None),
+  "enclen.encoded_lengths": (_arg("strings", size=_total), None),
+  "firstclass_codec.obfuscate": (_arg("message"), _size),
+  "firstclass_codec.deobfuscate": (_arg("text"), _size),
+  "normalize.normalize": (_arg("s"), _size),
+  "normalize.normalize_batch": (_arg("strings", size=_total), _total),
+  "recover.RecoveringDecoder.decode": (_arg("data", 1), _size),
+  "transcode.transcoded_size": (_arg("data"), None),
+  "transcode.transcode_file": (_path_size, _written),
+  "ucd_tables.records": (_arg("s"), _size),
+  "ucd_tables.categories": (_arg("s"), _total),
+  "ucd_tables.east_asian_widths": (_arg("s"), _total),
+  "ucd_tables.utf8_lengths": (_arg("s"), _size),
+  "uchr.make_uchr": (_arg("code"), _size),
+  "uchr.parse_uchr": (_arg("source"), _size),
+  "uchr.parse_uchr_codepoints": (_arg("source"), None),
+}
+
+
+class Stats:
+  __slots__ = ("calls", "errors", "seconds", "bytes_in", "bytes_out", "buckets")
+
+  def __init__(self):
+    self.calls = self.errors = self.bytes_in = self.bytes_out = 0
+    self.seconds = 0.0
+    self.buckets = [0] * (len(BUCKETS) + 1)
+
+  def as_dict(self, key: str = "") -> dict:
+    result = {"calls": self.calls, "errors": self.errors, "seconds": self.seconds}
+    size_in, size_out = PAYLOADS.get(key, (None, None))
+    if size_in:
+      result["bytes_in"] = self.bytes_in
+    if size_out:
+      result["bytes_out"] = self.bytes_out
+    result["buckets"] = dict(zip(BUCKETS + (float("inf"),), self.buckets))
+    return result
+
+
+_stats: dict[str, Stats] = {}
+_events: dict[str, int] = {}
+_originals: dict[str, tuple] = {}
+
+
+def _wrap(key: str, fn: Callable) -> Callable:
+  stats = _stats.setdefault(key, Stats())
+  clock = time.perf_counter
+  size_in, size_out = PAYLOADS.get(key, (None, None))
+
+  @functools.wraps(fn)
+  def wrapper(*args, **kwargs):
+    start = clock()
+    try:
+      result = fn(*args, **kwargs)
+    except Exception:
+      stats.errors += 1
+      raise
+    finally:
+      elapsed = clock() - start
+      stats.calls += 1
+      stats.seconds += elapsed
+      stats.buckets[bisect_left(BUCKETS, elapsed)] += 1
+    if size_in:
+      stats.bytes_in += size_in(args, kwargs)
+    if size_out:
+      stats.bytes_out += size_out(result)
+    return result
+
+  return wrapper
+
+
+def _targets() -> Iterator[tuple]:
+  for module_name, names in INSTRUMENTED.items():
+    __import__(f"genesis.{module_name}")
+    module = sys.modules[f"genesis.{module_name}"]
+    for name in names:
+      owner, _, attr = name.rpartition(".")
+      yield f"{module_name}.{name}", getattr(module, owner) if owner else module, attr
+
+
+def enable() -> None:
+  # Only lookups made after this see the wrappers: a name bound earlier with
+  # "from genesis.bitseq import make_bitseq" keeps calling the plain function.
+  global ENABLED
+  if ENABLED:
+    return
+  package = sys.modules["genesis"]
+  for key, owner, attr in _targets():
+    fn = owner.__dict__[attr]
+    _originals[key] = (owner, attr, fn)
+    wrapper = _wrap(key, fn)
+    setattr(owner, attr, wrapper)
+    if package.__dict__.get(attr) is fn:
+      setattr(package, attr, wrapper)
+  ENABLED = True
+
+
+def disable() -> None:
+  global ENABLED
+  package = sys.modules["genesis"]
+  for owner, attr, fn in _originals.values():
+    wrapper = owner.__dict__[attr]
+    setattr(owner, attr, fn)
+    if package.__dict__.get(attr) is wrapper:
+      setattr(package, attr, fn)
+  _originals.clear()
+  ENABLED = False
+
+
+def reset() -> None:
+  for stats in _stats.values():
+    stats.__init__()
+  _events.clear()
+
+
+def count(event: str, n: int = 1) -> None:
+  # Called by the helpers behind "if metrics.ENABLED", for fallbacks and
+  # recoveries that no call count would show.
+  _events[event] = _events.get(event, 0) + n
+
+
+def snapshot() -> dict:
+  return {
+    "functions": {key: stats.as_dict(key) for key, stats in sorted(_stats.items()) if stats.calls},
+    "events": dict(sorted(_events.items())),
+  }
+
+
+def prometheus(prefix: str = "genesis") -> str:
+  lines = []
+  functions = [(key, stats) for key, stats in sorted(_stats.items()) if stats.calls]
+  for metric, attr, side, help_text in (
+    ("calls_total", "calls", None, "Calls per helper."),
+    ("errors_total", "errors", None, "Calls that raised."),
+    ("bytes_in_total", "bytes_in", 0, "Input payload size: characters for str, bytes otherwise."),
+    ("bytes_out_total", "bytes_out", 1, "Output payload size: characters for str, bytes otherwise."),
+  ):
+    lines.append(f"# HELP {prefix}_{metric} {help_text}")
+    lines.append(f"# TYPE {prefix}_{metric} counter")
+    lines.extend(f'{prefix}_{metric}{{function="{key}"}} {getattr(stats, attr)}' for key, stats in functions
+                 if side is None or PAYLOADS.get(key, (None, None))[side])
+  lines.append(f"# HELP {prefix}_seconds Time spent per call.")
+  lines.append(f"# TYPE {prefix}_seconds histogram")
+  for key, stats in functions:
+    total = 0
+    for bound, n in zip(BUCKETS + (float("inf"),), stats.buckets):
+      total += n
+      le = "+Inf" if bound == float("inf") else repr(bound)
+      lines.append(f'{prefix}_seconds_bucket{{function="{key}",le="{le}"}} {total}')
+    lines.append(f'{prefix}_seconds_sum{{function="{key}"}} {stats.seconds!r}')
+    lines.append(f'{prefix}_seconds_count{{function="{key}"}} {stats.calls}')
+  lines.append(f"# HELP {prefix}_events_total Fallback, recovery and slow-path counts.")
+  lines.append(f"# TYPE {prefix}_events_total counter")
+  lines.extend(f'{prefix}_events_total{{event="{event}"}} {n}' for event, n in sorted(_events.items()))
+  return "\n".join(lines) + "\n"
+
+
+class Capture:
+  # cProfile and tracemalloc around a with block, imported only when asked
+  # for; results are on the Capture once the block exits. A class rather
+  # than contextlib.contextmanager, which would add contextlib to the import
+  # of every helper that checks ENABLED.
+  def __init__(self, cpu: bool = True, memory: bool = True, frames: int = 1):
+    self.cpu, self.frames = cpu, frames
+    self.tracing = memory
+    self.profile = None
+    self.memory = None
+    self.peak = 0
+    self._started = False
+
+  def __enter__(self) -> "Capture":
+    if self.tracing:
+      import tracemalloc
+
+      self._started = not tracemalloc.is_tracing()
+      if self._started:
+        tracemalloc.start(self.frames)
+      tracemalloc.reset_peak()
+    if self.cpu:
+      import cProfile
+
+      self.profile = cProfile.Profile()
+      self.profile.enable()
+    return self
+
+  def __exit__(self, *exc) -> None:
+    if self.cpu:
+      self.profile.disable()
+    if self.tracing:
+      import tracemalloc
+
+      self.memory = tracemalloc.take_snapshot()
+      self.peak = tracemalloc.get_traced_memory()[1]
+      if self._started:
+        tracemalloc.stop()
+
+  def stats(self, sort: str = "cumulative"):
+    import pstats
+
+    return pstats.Stats(self.profile).sort_stats(sort)
+
+  def top_allocations(self, limit: int = 10, key: str = "lineno") -> list:
+    return self.memory.statistics(key)[:limit]
+
+
+capture = Capture
+
+
+if __name__ == "__main__":
+  import timeit
+
+  import genesis
+  # Run as __main__, this file is a second copy of the module; the helpers
+  # check the imported one.
+  from genesis import bitseq, metrics, recover, uchr
+
+  text = "記者 鄭啟源 羅智堅 résumé El Niño 🤨 " * 2000
+  data = text.encode("utf-8")
+  plain = min(timeit.repeat(lambda: bitseq.make_bitseq_bulk(data), number=20, repeat=5))
+  metrics.enable()
+  assert genesis.make_bitseq is bitseq.make_bitseq is not bitseq.make_bitseq.__wrapped__
+  bitseq.make_bitseq_bulk(data)
+  uchr.parse_uchr("U+0041 U+D800 U+0042..U+0043")
+  list(recover.decode_chunks([b"ok \xbc", b" cup"]))
+  try:
+    bitseq.make_bitseq("é")
+  except ValueError:
+    pass
+  snap = metrics.snapshot()
+  assert snap["functions"]["bitseq.make_bitseq_bulk"]["bytes_in"] == len(data)
+  assert snap["functions"]["bitseq.make_bitseq"]["errors"] == 1
+  assert snap["functions"]["recover.RecoveringDecoder.decode"]["calls"] == 3
+  assert snap["events"] == {"recover.fallback": 1, "uchr.errors": 1, "uchr.slow_path": 1}, snap["events"]
+  dump = metrics.prometheus()
+  assert 'genesis_calls_total{function="uchr.parse_uchr"} 1' in dump and "genesis_seconds_bucket" in dump
+  on = min(timeit.repeat(lambda: bitseq.make_bitseq_bulk(data), number=20, repeat=5))
+  metrics.disable()
+  assert not hasattr(bitseq.make_bitseq, "__wrapped__") and genesis.make_bitseq is bitseq.make_bitseq
+  off = min(timeit.repeat(lambda: bitseq.make_bitseq_bulk(data), number=20, repeat=5))
+  with metrics.capture() as cap:
+    bitseq.make_bitseq_encoded(text)
+  assert cap.stats().total_calls and cap.peak
+  print(f"make_bitseq_bulk x20: plain {plain:.4f}s, enabled {on:.4f}s, disabled again {off:.4f}s; "
+        f"captured peak {cap.peak / 1024:.0f} KiB")
+  print(dump.splitlines()[2])
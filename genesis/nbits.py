@@ -0,0 +1,64 @@
+from array import array
+from collections.abc import Iterable, Sequence
+from itertools import repeat
+from operator import sub
+
+
+def n_possible_values(nbits: int) -> int:
+  return 1 << nbits
+
+
+def n_bits_required(nvalues: int) -> int:
+  if nvalues < 1:
+    raise ValueError(f"nvalues must be at least 1, got {nvalues}")
+  return (nvalues - 1).bit_length()
+
+
+def n_bits_required_batch(counts: Iterable[int]) -> array:
+  counts = counts if isinstance(counts, (array, list, tuple)) else list(counts)
+  if counts and min(counts) < 1:
+    raise ValueError(f"nvalues must be at least 1, got {min(counts)}")
+  # map() keeps the per-element work in C: (n - 1).bit_length() for every n.
+  return array("B", map(int.bit_length, map(sub, counts, repeat(1))))
+
+
+def n_possible_values_batch(widths: Sequence[int], typecode: str = "Q") -> array:
+  limit = array(typecode).itemsize * 8 - typecode.islower()
+  for i, nbits in enumerate(widths):
+    if not 0 <= nbits < limit:
+      raise OverflowError(f"widths[{i}] = {nbits}: 2 ** {nbits} does not fit array typecode {typecode!r}")
+  return array(typecode, map((1).__lshift__, widths))
+
+
+if __name__ == "__main__":
+  import random
+  import timeit
+  from math import ceil, log
+
+  def brute_bits(nvalues: int) -> int:
+    nbits = 0
+    while 2 ** nbits < nvalues:
+      nbits += 1
+    return nbits
+
+  rng = random.Random(0)
+  edges = [1, 2, 3, 110, 128, 256, 2 ** 53 + 1, 2 ** 64, 2 ** 64 + 1, 2 ** 100 - 1]
+  samples = edges + [rng.randrange(1, 2 ** rng.randrange(1, 80)) for _ in range(5000)]
+  for n in samples:
+    assert n_bits_required(n) == brute_bits(n), n
+    assert n_possible_values(n_bits_required(n)) >= n
+  widths = n_bits_required_batch(samples)
+  assert list(widths) == [brute_bits(n) for n in samples]
+  assert list(n_possible_values_batch(range(64))) == [2 ** w for w in range(64)]
+  try:
+    n_possible_values_batch([3, 64])
+  except OverflowError:
+    pass
+  else:
+    raise AssertionError("2 ** 64 should not fit typecode 'Q'")
+  print("wrong with ceil(log(n) / log(2)):", [n for n in edges if ceil(log(n) / log(2)) != brute_bits(n)])
+
+  counts = array("q", (rng.randrange(1, 2 ** 40) for _ in range(1000000)))
+  old = min(timeit.repeat(lambda: [ceil(log(n) / log(2)) for n in counts], number=1, repeat=3))
+  new = min(timeit.repeat(lambda: n_bits_required_batch(counts), number=1, repeat=3))
+  print(f"{len(counts)} counts: ceil/log {old:.4f}s, n_bits_required_batch {new:.4f}s ({old / new:.1f}x)")
@@ -0,0 +1,79 @@
+from collections import namedtuple
+from collections.abc import Iterable, Iterator
+from functools import partial
+from io import BufferedIOBase
+
+from . import metrics
+from .codec_cache import decoder, incremental_decoder
+
+CHUNK_SIZE = 1 << 16
+
+
+Repair = namedtuple("Repair", ("start", "end", "text"))
+
+
+class RecoveringDecoder:
+  def __init__(self, encoding: str = "utf-8", fallback: str = "latin-1", repairs: list[Repair] | None = None):
+    self.decoder = incremental_decoder(encoding)
+    self.fallback = decoder(fallback, "replace")
+    self.repairs = [] if repairs is None else repairs
+    self.consumed = 0
+
+  def decode(self, data: bytes, final: bool = False) -> str:
+    pending, flag = self.decoder.getstate()
+    buf = memoryview(pending + data) if pending else memoryview(data)
+    base = self.consumed - len(pending)
+    self.consumed += len(data)
+    self.decoder.setstate((b"", flag))
+    out = []
+    pos = 0
+    while True:
+      try:
+        out.append(self.decoder.decode(buf[pos:], final))
+        return "".join(out)
+      except UnicodeDecodeError as e:
+        # A failed decode leaves the decoder state untouched, so the good
+        # prefix before the bad span decodes cleanly from the same state.
+        start, end = pos + e.start, pos + e.end
+        out.append(self.decoder.decode(buf[pos:start]))
+        text = self.fallback(buf[start:end])
+        self.repairs.append(Repair(base + start, base + end, text))
+        if metrics.ENABLED:
+          metrics.count("recover.fallback")
+        out.append(text)
+        pos = end
+
+  def reset(self) -> None:
+    self.decoder.reset()
+    self.consumed = 0
+
+
+def decode_chunks(chunks: Iterable[bytes], encoding: str = "utf-8", fallback: str = "latin-1",
+                  repairs: list[Repair] | None = None) -> Iterator[str]:
+  decoder = RecoveringDecoder(encoding, fallback, repairs)
+  for chunk in chunks:
+    text = decoder.decode(chunk)
+    if text:
+      yield text
+  text = decoder.decode(b"", final=True)
+  if text:
+    yield text
+
+
+def decode_file(f: BufferedIOBase, encoding: str = "utf-8", fallback: str = "latin-1",
+                repairs: list[Repair] | None = None, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+  return decode_chunks(iter(partial(f.read, chunk_size), b""), encoding, fallback, repairs)
+
+
+if __name__ == "__main__":
+  import time
+
+  good = "記者 鄭啟源 羅智堅 αβγδ 🤨 ".encode("utf-8")
+  data = good * 100000 + b"\xbc cup of flour " + good * 1000 + b"\xf0\x9f"
+  repairs = []
+  start = time.perf_counter()
+  text = "".join(decode_chunks((data[i:i + 4093] for i in range(0, len(data), 4093)), repairs=repairs))
+  elapsed = time.perf_counter() - start
+  assert text == data.decode("utf-8", "replace").replace("�", "¼", 1)[:-1] + "ð\x9f"
+  assert [r[:2] for r in repairs] == [(len(good) * 100000, len(good) * 100000 + 1), (len(data) - 2, len(data))]
+  print(f"decoded {len(data) / 1e6:.1f} MB in 4 KB chunks with {len(repairs)} repairs in {elapsed:.3f}s")
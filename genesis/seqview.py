@@ -0,0 +1,144 @@
+from array import array
+from collections.abc import Iterator, Sequence
+from operator import index
+
+
+def _count(start: int, stop: int, step: int) -> int:
+  if step > 0:
+    return max(0, (stop - start + step - 1) // step)
+  return max(0, (start - stop - step - 1) // -step)
+
+
+class ArithmeticSequence(Sequence):
+  # range() semantics kept as start + i * step for 0 <= i < length, so
+  # length, indexing and membership are closed-form even past sys.maxsize.
+  def __init__(self, start: int, stop: int = None, step: int = 1):
+    if stop is None:
+      start, stop = 0, start
+    start, stop, step = index(start), index(stop), index(step)
+    if step == 0:
+      raise ValueError("ArithmeticSequence() arg 3 must not be zero")
+    self.start = start
+    self.step = step
+    self.length = _count(start, stop, step)
+
+  @classmethod
+  def _make(cls, start: int, step: int, length: int) -> "ArithmeticSequence":
+    seq = cls.__new__(cls)
+    seq.start, seq.step, seq.length = start, step, length
+    return seq
+
+  @property
+  def stop(self) -> int:
+    return self.start + self.length * self.step
+
+  def _range(self) -> range:
+    return range(self.start, self.stop, self.step)
+
+  def __len__(self) -> int:
+    # Like len(range(...)), this raises OverflowError past sys.maxsize; use
+    # .length for the exact count.
+    return self.length
+
+  def __getitem__(self, i: int | slice) -> "int | ArithmeticSequence":
+    if isinstance(i, slice):
+      first, last, step = i.indices(self.length)
+      return self._make(self.start + first * self.step, self.step * step, _count(first, last, step))
+    i = index(i)
+    if i < 0:
+      i += self.length
+    if not 0 <= i < self.length:
+      raise IndexError("ArithmeticSequence index out of range")
+    return self.start + i * self.step
+
+  def __contains__(self, value) -> bool:
+    if isinstance(value, float) and value.is_integer():
+      value = int(value)
+    if not isinstance(value, int):
+      return False
+    offset, rem = divmod(value - self.start, self.step)
+    return rem == 0 and 0 <= offset < self.length
+
+  def index(self, value, start: int = 0, stop: int = None) -> int:
+    if value in self:
+      i = (value - self.start) // self.step
+      if start <= i and (stop is None or i < stop):
+        return i
+    raise ValueError(f"{value!r} is not in sequence")
+
+  def count(self, value) -> int:
+    return int(value in self)
+
+  def __iter__(self) -> Iterator[int]:
+    return iter(self._range())
+
+  def __reversed__(self) -> Iterator[int]:
+    return iter(self.reversed())
+
+  def reversed(self) -> "ArithmeticSequence":
+    if not self.length:
+      return self
+    return self._make(self.start + (self.length - 1) * self.step, -self.step, self.length)
+
+  def _parity(self, parity: int) -> "ArithmeticSequence":
+    if self.step % 2 == 0:
+      return self if self.start % 2 == parity else self._make(self.start, self.step, 0)
+    return self[(self.start - parity) % 2::2]
+
+  def evens(self) -> "ArithmeticSequence":
+    return self._parity(0)
+
+  def odds(self) -> "ArithmeticSequence":
+    return self._parity(1)
+
+  def to_array(self, typecode: str = "q") -> array:
+    return array(typecode, self._range())
+
+  def to_numpy(self, dtype: str = "int64"):
+    import numpy
+
+    return numpy.arange(self.start, self.stop, self.step, dtype=dtype)
+
+  def __eq__(self, other) -> bool:
+    if not isinstance(other, (ArithmeticSequence, range)):
+      return NotImplemented
+    if (other.length if isinstance(other, ArithmeticSequence) else len(other)) != self.length:
+      return False
+    if not self.length:
+      return True
+    return other[0] == self.start and (self.length == 1 or other.step == self.step)
+
+  def __hash__(self) -> int:
+    if not self.length:
+      return hash((0, None, None))
+    return hash((self.length, self.start, self.step if self.length > 1 else None))
+
+  def __repr__(self) -> str:
+    return f"ArithmeticSequence({self.start}, {self.stop}, {self.step})"
+
+
+EVEN_NUMS = ArithmeticSequence(100, 0, -2)
+ODD_NO = ArithmeticSequence(23, 5, -2)
+ONE_TO_TEN = ArithmeticSequence(55, 11, -1)
+
+
+if __name__ == "__main__":
+  import random
+
+  rng = random.Random(0)
+  for _ in range(2000):
+    args = rng.randrange(-50, 50), rng.randrange(-50, 50), rng.choice([-7, -2, -1, 1, 2, 3, 10])
+    r, seq = range(*args), ArithmeticSequence(*args)
+    assert list(seq) == list(r) and len(seq) == len(r) and seq == r
+    assert list(reversed(seq)) == list(reversed(r))
+    s = slice(rng.choice([None, -3, 2, 40]), rng.choice([None, -1, 5, 60]), rng.choice([None, -2, 1, 3]))
+    assert list(seq[s]) == list(r[s]) and seq[s] == r[s]
+    assert list(seq.evens()) == [v for v in r if v % 2 == 0]
+    assert list(seq.odds()) == [v for v in r if v % 2]
+    for v in range(-60, 60):
+      assert (v in seq) == (v in r)
+  assert list(EVEN_NUMS) == list(range(100, 0, -2)) and EVEN_NUMS.to_array().tolist() == list(EVEN_NUMS)
+  huge = ArithmeticSequence(10 ** 30, 0, -3)
+  assert huge.length == (10 ** 30 + 2) // 3 and huge[-1] == 1 and 10 ** 30 - 3 * 10 ** 20 in huge
+  assert list(huge.odds()[:3]) == [10 ** 30 - 3, 10 ** 30 - 9, 10 ** 30 - 15]
+  print(huge, huge.evens()[10 ** 25], huge[::-1][:2].reversed())
@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+import json
+import os
+import struct
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from . import bitseq, detect, uchr
+from .codec_cache import incremental_decoder, incremental_encoder
+
+OPS = ("transcode", "detect", "bitseq", "uchr")
+CHUNK_SIZE = 1 << 16
+BATCH_SIZE = 1 << 20
+OFFLOAD_SIZE = 1 << 16
+MAX_BUFFERED = 64 << 20
+
+# A request is a _HEAD (op index, options length), the options as JSON, then
+# the payload as _LENGTH-prefixed chunks ending with an empty one. A response
+# is a run of _FRAME (kind, length) frames: DATA chunks, then END, or ERROR
+# carrying the message.
+_HEAD = struct.Struct(">BH")
+_LENGTH = struct.Struct(">I")
+_FRAME = struct.Struct(">BI")
+DATA, END, ERROR = 0, 1, 2
+
+
+async def read_chunks(reader: asyncio.StreamReader) -> AsyncIterator[bytes]:
+  while True:
+    (n,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if not n:
+      return
+    yield await reader.readexactly(n)
+
+
+async def write_chunks(writer: asyncio.StreamWriter, data: bytes, kind: int | None = DATA) -> None:
+  # Waiting on drain() after every chunk is the backpressure: a peer that
+  # reads slowly stalls this coroutine instead of growing the send buffer.
+  # kind=None writes request chunks, which carry no frame kind.
+  view = memoryview(data)
+  for i in range(0, len(view), CHUNK_SIZE):
+    piece = view[i:i + CHUNK_SIZE]
+    head = _LENGTH.pack(len(piece)) if kind is None else _FRAME.pack(kind, len(piece))
+    writer.writelines((head, piece))
+    await writer.drain()
+
+
+async def _batches(chunks: AsyncIterator[bytes], size: int = BATCH_SIZE) -> AsyncIterator[bytes]:
+  pending: list[bytes] = []
+  n = 0
+  async for chunk in chunks:
+    pending.append(chunk)
+    n += len(chunk)
+    if n >= size:
+      yield b"".join(pending)
+      pending, n = [], 0
+  if pending:
+    yield b"".join(pending)
+
+
+async def _gather(chunks: AsyncIterator[bytes]) -> bytes:
+  pending: list[bytes] = []
+  n = 0
+  async for chunk in chunks:
+    n += len(chunk)
+    if n > MAX_BUFFERED:
+      raise ValueError(f"payload over {MAX_BUFFERED} bytes")
+    pending.append(chunk)
+  return b"".join(pending)
+
+
+def _parse_uchr(data: bytes) -> bytes:
+  text, errors = uchr.parse_uchr(data)
+  return json.dumps({"text": text, "errors": [e._asdict() for e in errors]}).encode("utf-8")
+
+
+class Server:
+  def __init__(self, path: str | None = None, host: str = "127.0.0.1", port: int = 0,
+               workers: int | None = None, executor: Executor | None = None):
+    self.path, self.host, self.port = path, host, port
+    # workers=0 keeps all work on the event loop, as firstclass_batch.run does.
+    self._own = executor is None and workers != 0
+    self.executor = ProcessPoolExecutor(max_workers=workers) if self._own else executor
+    self.server: asyncio.AbstractServer | None = None
+    self._tasks: set[asyncio.Task] = set()
+    self._ops: dict[str, Callable] = {"transcode": self._transcode, "detect": self._detect, "bitseq": self._bitseq,
+                                      "uchr": self._uchr}
+
+  async def start(self) -> "Server":
+    if self.path:
+      self.server = await asyncio.start_unix_server(self._serve, self.path, limit=2 * CHUNK_SIZE)
+    else:
+      self.server = await asyncio.start_server(self._serve, self.host, self.port, limit=2 * CHUNK_SIZE)
+      self.host, self.port = self.server.sockets[0].getsockname()[:2]
+    return self
+
+  async def close(self) -> None:
+    if self.server:
+      self.server.close()
+      # Before 3.12, wait_closed() returns with connections still open, so
+      # idle handlers are cancelled here rather than left to asyncio.run().
+      for task in self._tasks:
+        task.cancel()
+      await asyncio.gather(*self._tasks, return_exceptions=True)
+      await self.server.wait_closed()
+    if self._own:
+      self.executor.shutdown(cancel_futures=True)
+
+  async def _offload(self, fn: Callable, data: bytes) -> bytes:
+    if self.executor is None or len(data) < OFFLOAD_SIZE:
+      return fn(data)
+    return await asyncio.get_running_loop().run_in_executor(self.executor, fn, data)
+
+  async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    # One connection carries any number of requests, one after another.
+    task = asyncio.current_task()
+    self._tasks.add(task)
+    try:
+      while True:
+        try:
+          op, size = _HEAD.unpack(await reader.readexactly(_HEAD.size))
+        except asyncio.IncompleteReadError as e:
+          if e.partial:
+            raise
+          return
+        options = json.loads(await reader.readexactly(size) or b"{}")
+        chunks = read_chunks(reader)
+        try:
+          if op >= len(OPS):
+            raise ValueError(f"unknown op {op}")
+          await self._ops[OPS[op]](chunks, writer, **options)
+        except (ValueError, LookupError, TypeError) as e:
+          # Read what is left of the payload so the next request starts on a
+          # frame boundary; the ERROR frame then ends the response.
+          async for _ in chunks:
+            pass
+          message = f"{type(e).__name__}: {e}".encode("utf-8")
+          writer.write(_FRAME.pack(ERROR, len(message)) + message)
+        else:
+          writer.write(_FRAME.pack(END, 0))
+        await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError, json.JSONDecodeError, asyncio.CancelledError):
+      pass
+    finally:
+      self._tasks.discard(task)
+      writer.close()
+
+  async def _transcode(self, chunks, writer, src: str = "utf-8", dst: str = "utf-8", errors: str = "strict") -> None:
+    # Incremental codecs carry split sequences across chunk boundaries, and
+    # they run at C speed, so this streams on the event loop.
+    decoder = incremental_decoder(src, errors)
+    encoder = incremental_encoder(dst, errors)
+    async for chunk in chunks:
+      out = encoder.encode(decoder.decode(chunk))
+      if out:
+        await write_chunks(writer, out)
+    out = encoder.encode(decoder.decode(b"", True), True)
+    if out:
+      await write_chunks(writer, out)
+
+  async def _detect(self, chunks, writer, sample_size: int = detect.SAMPLE_SIZE) -> None:
+    sample = []
+    n = 0
+    async for chunk in chunks:
+      if n <= sample_size:
+        sample.append(chunk)
+        n += len(chunk)
+    found = detect.detect_encoding(b"".join(sample), sample_size)
+    await write_chunks(writer, json.dumps(found._asdict()).encode("utf-8"))
+
+  async def _bitseq(self, chunks, writer) -> None:
+    first = True
+    async for batch in _batches(chunks):
+      if not first:
+        await write_chunks(writer, b" ")
+      first = False
+      await write_chunks(writer, await self._offload(bitseq.make_bitseq_bulk, batch))
+
+  async def _uchr(self, chunks, writer) -> None:
+    await write_chunks(writer, await self._offload(_parse_uchr, await _gather(chunks)))
+
+
+async def serve(path: str | None = None, host: str = "127.0.0.1", port: int = 0,
+                workers: int | None = None) -> None:
+  server = await Server(path, host, port, workers).start()
+  print(f"listening on {path or f'{server.host}:{server.port}'}", flush=True)
+  try:
+    await server.server.serve_forever()
+  finally:
+    await server.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+  parser = argparse.ArgumentParser(description="Serve transcode, detect, bitseq and uchr requests on a local socket.")
+  parser.add_argument("--unix", metavar="PATH", help="listen on a Unix domain socket instead of TCP")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=8765)
+  parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes; 0 runs all on the loop")
+  args = parser.parse_args(argv)
+  try:
+    asyncio.run(serve(args.unix, args.host, args.port, args.workers))
+  except KeyboardInterrupt:
+    pass
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,142 @@
+import mmap
+import os
+from collections.abc import Callable
+
+from .codec_cache import canonical, incremental_decoder, incremental_encoder
+
+WINDOW = 1 << 20
+ENCODINGS = ("utf-8", "utf-16-le", "utf-16-be", "utf-32-le", "utf-32-be")
+
+
+def _table(pred: Callable[[int], bool]) -> bytes:
+  return bytes(1 if pred(b) else 0 for b in range(256))
+
+
+_IS_CONT = _table(lambda b: 0x80 <= b < 0xC0)
+_IS_LEAD4 = _table(lambda b: b >= 0xF0)
+_IS_ZERO = _table(lambda b: b == 0)
+_NONZERO = _table(lambda b: b != 0)
+_IS_ASCII = _table(lambda b: b < 0x80)
+_BELOW_8 = _table(lambda b: b < 0x08)
+_IS_HIGH = _table(lambda b: 0xD8 <= b < 0xDC)
+_IS_SURROGATE = _table(lambda b: 0xD8 <= b < 0xE0)
+
+
+def _flags(column: bytes, table: bytes) -> int:
+  # Every byte becomes 0 or 1, so the column reads as one big integer whose
+  # set bits can be counted, or ANDed with another column's flags.
+  return int.from_bytes(column.translate(table), "little")
+
+
+def _count(column: bytes, table: bytes) -> int:
+  return _flags(column, table).bit_count()
+
+
+def _sizes(window: bytes, src: str) -> tuple[int, int, int]:
+  # (code points, UTF-8 bytes, UTF-16 units) in one window of whole units.
+  if src == "utf-8":
+    cps = len(window) - _count(window, _IS_CONT)
+    return cps, len(window), cps + _count(window, _IS_LEAD4)
+  if src.startswith("utf-16"):
+    lo, hi = (window[0::2], window[1::2]) if src.endswith("le") else (window[1::2], window[0::2])
+    units = len(hi)
+    pairs = _count(hi, _IS_HIGH)
+    # 3 bytes per unit, minus one below U+0800, minus one more below U+0080;
+    # each surrogate unit contributes 2 so a pair comes to 4.
+    ascii = (_flags(hi, _IS_ZERO) & _flags(lo, _IS_ASCII)).bit_count()
+    utf8 = 3 * units - _count(hi, _BELOW_8) - ascii - _count(hi, _IS_SURROGATE)
+    return units - pairs, utf8, units
+  cols = [window[k::4] for k in range(4)]
+  if src.endswith("be"):
+    cols.reverse()
+  cps = len(cols[0])
+  supplementary = _count(cols[2], _NONZERO)
+  bmp = _flags(cols[2], _IS_ZERO)
+  ascii = (bmp & _flags(cols[1], _IS_ZERO) & _flags(cols[0], _IS_ASCII)).bit_count()
+  below_800 = (bmp & _flags(cols[1], _BELOW_8)).bit_count()
+  utf8 = 3 * cps + supplementary - below_800 - ascii
+  return cps, utf8, cps + supplementary
+
+
+def transcoded_size(data, src: str, dst: str, window: int = WINDOW) -> int:
+  window -= window % 4
+  cps = utf8 = utf16 = 0
+  for start in range(0, len(data), window):
+    c, u8, u16 = _sizes(data[start:start + window], src)
+    cps, utf8, utf16 = cps + c, utf8 + u8, utf16 + u16
+  if dst == "utf-8":
+    return utf8
+  return 2 * utf16 if dst.startswith("utf-16") else 4 * cps
+
+
+def _check(encoding: str) -> str:
+  name = canonical(encoding)
+  if name not in ENCODINGS:
+    raise ValueError(f"unsupported encoding {encoding!r}: use one of {', '.join(ENCODINGS)}")
+  return name
+
+
+def _transcode(f_in, f_out, src_path: str, src: str, dst: str, window: int) -> int:
+  if os.fstat(f_in.fileno()).st_size == 0:
+    return 0
+  with mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as data:
+    size = transcoded_size(data, src, dst, window)
+    if size == 0:
+      return 0
+    f_out.truncate(size)
+    with mmap.mmap(f_out.fileno(), size) as out:
+      decoder = incremental_decoder(src)
+      encoder = incremental_encoder(dst)
+      pos = 0
+      for start in range(0, len(data), window):
+        final = start + window >= len(data)
+        chunk = encoder.encode(decoder.decode(data[start:start + window], final), final)
+        out[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+      if pos != size:
+        raise ValueError(f"{src_path}: expected {size} output bytes, wrote {pos}")
+  return size
+
+
+def transcode_file(src_path: str, dst_path: str, src: str, dst: str, window: int = WINDOW) -> int:
+  src, dst = _check(src), _check(dst)
+  window -= window % 4
+  with open(src_path, "rb") as f_in:
+    f_out = open(dst_path, "w+b")
+    try:
+      with f_out:
+        return _transcode(f_in, f_out, src_path, src, dst, window)
+    except BaseException:
+      # The output is sized before anything is decoded, so invalid input
+      # would leave it zero-filled from the first bad window on.
+      os.remove(dst_path)
+      raise
+
+
+if __name__ == "__main__":
+  import tempfile
+  import time
+
+  text = "記者 鄭啟源 羅智堅 résumé El Niño 🤨 shrimp and grits\n" * 200000
+  with tempfile.TemporaryDirectory() as tmp:
+    bad = os.path.join(tmp, "bad")
+    with open(bad, "wb") as f:
+      f.write(b"abc\xffdef")
+    try:
+      transcode_file(bad, bad + "-out", "utf-8", "utf-16-le")
+    except UnicodeDecodeError:
+      assert not os.path.exists(bad + "-out")
+    else:
+      raise AssertionError("invalid UTF-8 was transcoded")
+    for src in ENCODINGS:
+      src_path = os.path.join(tmp, src)
+      with open(src_path, "wb") as f:
+        f.write(text.encode(src))
+      for dst in ENCODINGS:
+        dst_path = os.path.join(tmp, f"{src}-to-{dst}")
+        start = time.perf_counter()
+        size = transcode_file(src_path, dst_path, src, dst, window=1 << 16)
+        elapsed = time.perf_counter() - start
+        with open(dst_path, "rb") as f:
+          assert f.read() == text.encode(dst), (src, dst)
+        print(f"{src:>9} -> {dst:<9} {size / 1e6:6.1f} MB in {elapsed:.3f}s")
@@ -0,0 +1,197 @@
+import mmap
+import os
+import struct
+import unicodedata
+from functools import lru_cache
+
+FORMAT = 1
+CATEGORIES = ("Cc", "Cf", "Cn", "Co", "Cs", "Ll", "Lm", "Lo", "Lt", "Lu", "Mc", "Me", "Mn", "Nd", "Nl",
+              "No", "Pc", "Pd", "Pe", "Pf", "Pi", "Po", "Ps", "Sc", "Sk", "Sm", "So", "Zl", "Zp", "Zs")
+WIDTHS = ("A", "F", "H", "N", "Na", "W")
+
+
+def _cache_dir() -> str:
+  # Per user rather than next to the module, which a system or zipped
+  # install leaves read-only; every process would then rebuild the tables.
+  if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+    return os.path.join(os.environ["LOCALAPPDATA"], "genesis", "cache")
+  return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "genesis")
+
+
+TABLES_PATH = os.path.join(_cache_dir(), f"ucd_tables-v{FORMAT}-{unicodedata.unidata_version}.bin")
+
+_MAGIC = b"UCDT"
+_HEADER = struct.Struct(">4sHH16s")
+_PLANES = 0x11
+# A record byte packs a code point's category index (high 5 bits) and East
+# Asian width index (low 3 bits); _CATEGORY_OF/_WIDTH_OF unpack whole strings
+# of records with one translate.
+_CATEGORY_OF = bytes(r >> 3 if r >> 3 < len(CATEGORIES) else 0 for r in range(256))
+_WIDTH_OF = bytes(r & 7 if r & 7 < len(WIDTHS) else 0 for r in range(256))
+
+
+def build_tables() -> bytes:
+  # Two-level layout: stage1 maps cp >> 8 to a block id, stage2 holds each
+  # distinct 256-record block once (160 blocks for Unicode 14/15).
+  cat_index = {c: i for i, c in enumerate(CATEGORIES)}
+  width_index = {w: i for i, w in enumerate(WIDTHS)}
+  blocks = {}
+  stage1 = bytearray()
+  for hi in range(_PLANES * 256):
+    chars = map(chr, range(hi << 8, (hi + 1) << 8))
+    block = bytes(cat_index[unicodedata.category(ch)] << 3 | width_index[unicodedata.east_asian_width(ch)] for ch in chars)
+    stage1.append(blocks.setdefault(block, len(blocks)))
+  header = _HEADER.pack(_MAGIC, FORMAT, len(blocks), unicodedata.unidata_version.encode("ascii"))
+  return header + bytes(stage1) + b"".join(blocks)
+
+
+def load_tables(path: str | None = None) -> tuple[memoryview, memoryview]:
+  # TABLES_PATH is read per call, so a test or a caller can repoint it.
+  path = TABLES_PATH if path is None else path
+  data = None
+  try:
+    with open(path, "rb") as f:
+      data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, nblocks, unidata = _HEADER.unpack_from(data)
+    if (magic, version, unidata.rstrip(b"\0").decode("ascii")) != (_MAGIC, FORMAT, unicodedata.unidata_version):
+      raise ValueError(f"{path} was built for another table format or Unicode version")
+  except (OSError, ValueError, struct.error):
+    if data is not None:
+      data.close()
+    data = build_tables()
+    # A temporary name per process, so concurrent first runs do not write
+    # into each other's file before the atomic rename.
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+      os.makedirs(os.path.dirname(path), exist_ok=True)
+      with open(tmp, "wb") as f:
+        f.write(data)
+      os.replace(tmp, path)
+    except OSError:
+      pass
+  view = memoryview(data)[_HEADER.size:]
+  return view[:_PLANES * 256], view[_PLANES * 256:]
+
+
+@lru_cache(maxsize=None)
+def _tables() -> tuple[memoryview, memoryview, bytes]:
+  # Loaded on first lookup rather than at import, so importing the module
+  # costs no file I/O and never triggers a rebuild.
+  stage1, stage2 = load_tables()
+  return stage1, stage2, bytes(stage2[stage1[0] << 8:(stage1[0] + 1) << 8])
+
+
+_UTF8_BMP_HI = bytes(3 if b >= 8 else 2 if b else 0 for b in range(256))
+_UTF8_LO = bytes(1 if b < 0x80 else 2 for b in range(256))
+
+
+def _record(ch: str) -> int:
+  stage1, stage2, _ = _tables()
+  cp = ord(ch)
+  return stage2[stage1[cp >> 8] << 8 | cp & 0xFF]
+
+
+def category(ch: str) -> str:
+  return CATEGORIES[_record(ch) >> 3]
+
+
+def east_asian_width(ch: str) -> str:
+  return WIDTHS[_record(ch) & 7]
+
+
+def utf8_length(ch: str) -> int:
+  cp = ord(ch)
+  return 1 + (cp >= 0x80) + (cp >= 0x800) + (cp >= 0x10000)
+
+
+@lru_cache(maxsize=256)
+def _equals(value: int) -> bytes:
+  return bytes(0xFF if b == value else 0 for b in range(256))
+
+
+def _distinct(column: bytes) -> list[int]:
+  # Deleting each value found keeps this at one C pass per distinct value,
+  # far cheaper than set() over a long column.
+  values = []
+  while column:
+    values.append(column[0])
+    column = column.translate(None, column[:1])
+  return values
+
+
+def _gather(index: bytes, key: bytes, tables: memoryview) -> bytes:
+  # Per character, look up tables[index * 256 + key] without a Python loop:
+  # translate the key column through the table of every index value that
+  # occurs, keep the positions holding that value with a big-integer mask,
+  # and OR the pieces together.
+  values = _distinct(index)
+  if len(values) == 1:
+    (value,) = values
+    return key.translate(tables[value << 8:(value + 1) << 8])
+  out = 0
+  for value in values:
+    part = int.from_bytes(key.translate(tables[value << 8:(value + 1) << 8]), "big")
+    out |= part & int.from_bytes(index.translate(_equals(value)), "big")
+  return out.to_bytes(len(key), "big")
+
+
+def records(s: str) -> bytes:
+  stage1, stage2, ascii_records = _tables()
+  if s.isascii():
+    return s.encode("ascii").translate(ascii_records)
+  data = s.encode("utf-32-be", "surrogatepass")
+  blocks = _gather(data[1::4], data[2::4], stage1)
+  return _gather(blocks, data[3::4], stage2)
+
+
+def category_codes(s: str) -> bytes:
+  return records(s).translate(_CATEGORY_OF)
+
+
+def width_codes(s: str) -> bytes:
+  return records(s).translate(_WIDTH_OF)
+
+
+def categories(s: str) -> list[str]:
+  return list(map(CATEGORIES.__getitem__, category_codes(s)))
+
+
+def east_asian_widths(s: str) -> list[str]:
+  return list(map(WIDTHS.__getitem__, width_codes(s)))
+
+
+def utf8_lengths(s: str) -> bytes:
+  if s.isascii():
+    return b"\x01" * len(s)
+  data = s.encode("utf-32-be", "surrogatepass")
+  planes, hi, lo = data[1::4], data[2::4], data[3::4]
+  lengths = int.from_bytes(hi.translate(_UTF8_BMP_HI), "big")
+  lengths |= int.from_bytes(lo.translate(_UTF8_LO), "big") & int.from_bytes(hi.translate(_equals(0)), "big")
+  if planes.count(0) != len(planes):
+    astral = int.from_bytes(planes.translate(_equals(0)), "big") ^ int.from_bytes(b"\xff" * len(planes), "big")
+    lengths = lengths & ~astral | int.from_bytes(b"\x04" * len(planes), "big") & astral
+  return lengths.to_bytes(len(s), "big")
+
+
+if __name__ == "__main__":
+  import random
+  import timeit
+
+  rng = random.Random(0)
+  sample = "".join(chr(rng.randrange(0x110000)) for _ in range(20000))
+  assert categories(sample) == [unicodedata.category(ch) for ch in sample]
+  assert east_asian_widths(sample) == [unicodedata.east_asian_width(ch) for ch in sample]
+  assert list(utf8_lengths(sample)) == [len(ch.encode("utf-8", "surrogatepass")) for ch in sample]
+  assert all(category(ch) == unicodedata.category(ch) for ch in sample)
+  assert records("shrimp and grits") == records("shrimp and grits\u00e9")[:-1]
+
+  text = "記者 鄭啟源 羅智堅 αβγδεζηθικλμνξοπρςστυφχψ résumé El Niño 🤨 shrimp and grits " * 20000
+  for label, old, new in (
+    ("category", lambda: [unicodedata.category(ch) for ch in text], lambda: categories(text)),
+    ("category as codes", lambda: [unicodedata.category(ch) for ch in text], lambda: category_codes(text)),
+    ("east_asian_width", lambda: [unicodedata.east_asian_width(ch) for ch in text], lambda: east_asian_widths(text)),
+    ("utf8 length", lambda: bytes(len(ch.encode("utf-8")) for ch in text), lambda: utf8_lengths(text)),
+  ):
+    old = min(timeit.repeat(old, number=1, repeat=3))
+    new = min(timeit.repeat(new, number=1, repeat=3))
+    print(f"{label} over {len(text)} chars: unicodedata {old:.4f}s, tables {new:.4f}s ({old / new:.1f}x)")
@@ -0,0 +1,202 @@
+from array import array
+from collections.abc import Sequence
+from operator import index
+
+STRIDE = 1024
+BLOCK = 1 << 16
+
+BytesLike = bytes | bytearray | memoryview
+
+
+def _is_continuation(b: int) -> bool:
+  return 0x80 <= b < 0xC0
+
+
+def _sequence_length(lead: int) -> int:
+  return 1 if lead < 0x80 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+
+
+class Utf8Index(Sequence):
+  # offsets[k] is the byte offset of character k * stride. A character is
+  # then one checkpoint lookup plus a decode of at most stride characters
+  # after it, and a run between checkpoints that turns out to be pure ASCII
+  # needs no decode at all.
+  def __init__(self, data=b"", stride: int = STRIDE):
+    if stride < 1:
+      raise ValueError("stride must be at least 1")
+    self.data = data
+    self.stride = stride
+    self.offsets = array("Q")
+    self.length = 0
+    self.indexed = 0
+    self._scan()
+
+  def _complete(self, end: int) -> int:
+    # end, or the start of a character that end would cut short: its lead
+    # byte is at most three continuation bytes back. Bytes that can never
+    # lead a sequence are left in, for the decode to reject.
+    pos = end - 1
+    while pos > self.indexed and pos > end - 4 and _is_continuation(self.data[pos]):
+      pos -= 1
+    lead = self.data[pos] if pos >= self.indexed else 0
+    if 0xC2 <= lead <= 0xF4 and pos + _sequence_length(lead) > end:
+      return pos
+    return end
+
+  def _scan(self) -> None:
+    # Works on locals and stores them only once every block has decoded, so
+    # invalid input leaves the index as it was.
+    data = self.data
+    n = self._complete(len(data))
+    start = self.indexed
+    offsets = array("Q")
+    length = self.length
+    next_char = len(self.offsets) * self.stride
+    while start < n:
+      end = min(start + BLOCK, n)
+      while end < n and _is_continuation(data[end]):
+        end += 1
+      block = bytes(data[start:end])
+      if block.isascii():
+        # Byte offset and character index move together: the checkpoints in
+        # this block are one arithmetic range.
+        first = start + next_char - length
+        offsets.extend(range(first, end, self.stride))
+        count = len(block)
+      else:
+        try:
+          text = block.decode("utf-8")
+        except UnicodeDecodeError as e:
+          raise ValueError(f"invalid UTF-8 at byte {start + e.start}: {e.reason}") from None
+        pos, prev = start, 0
+        for j in range(next_char - length, len(text), self.stride):
+          pos += len(text[prev:j].encode("utf-8"))
+          prev = j
+          offsets.append(pos)
+        count = len(text)
+      length += count
+      next_char = (len(self.offsets) + len(offsets)) * self.stride
+      start = end
+    self.offsets.extend(offsets)
+    self.length = length
+    self.indexed = start
+
+  def append(self, more: BytesLike) -> None:
+    # Grows the underlying buffer and indexes only the new bytes. Input may
+    # stop mid-character; those bytes are held back until the rest arrives.
+    # Bytes that fail to decode are taken off again.
+    if not isinstance(self.data, bytearray):
+      self.data = bytearray(self.data)
+    size = len(self.data)
+    self.data += more
+    try:
+      self._scan()
+    except ValueError:
+      del self.data[size:]
+      raise
+
+  def refresh(self, data) -> None:
+    # For a buffer that grew elsewhere, e.g. a file appended to and mapped
+    # again: the first self.indexed bytes must be unchanged. On invalid
+    # input the previous buffer is kept.
+    old, self.data = self.data, data
+    try:
+      self._scan()
+    except ValueError:
+      self.data = old
+      raise
+
+  def byte_offset(self, i: int) -> int:
+    i = index(i)
+    if not 0 <= i <= self.length:
+      raise IndexError("character index out of range")
+    if i == self.length:
+      return self.indexed
+    k, r = divmod(i, self.stride)
+    base = self.offsets[k]
+    if not r:
+      return base
+    end = self.offsets[k + 1] if k + 1 < len(self.offsets) else self.indexed
+    if end - base == min(self.stride, self.length - k * self.stride):
+      return base + r
+    # r characters take at most 4 * r bytes; a character cut at the end of
+    # that window is dropped by "ignore" and is not among the r anyway.
+    head = bytes(self.data[base:min(end, base + 4 * r)]).decode("utf-8", "ignore")
+    return base + len(head[:r].encode("utf-8"))
+
+  def __len__(self) -> int:
+    return self.length
+
+  def __getitem__(self, i: int | slice) -> str:
+    if isinstance(i, slice):
+      start, stop, step = i.indices(self.length)
+      if step != 1:
+        r = range(start, stop, step)
+        if not r:
+          return ""
+        lo = min(r[0], r[-1])
+        return self[lo:max(r[0], r[-1]) + 1][r[0] - lo::step]
+      if start >= stop:
+        return ""
+      return bytes(self.data[self.byte_offset(start):self.byte_offset(stop)]).decode("utf-8")
+    i = index(i)
+    if i < 0:
+      i += self.length
+    if not 0 <= i < self.length:
+      raise IndexError("Utf8Index index out of range")
+    pos = self.byte_offset(i)
+    return bytes(self.data[pos:pos + _sequence_length(self.data[pos])]).decode("utf-8")
+
+  def __repr__(self) -> str:
+    return f"Utf8Index({self.length} chars in {self.indexed} bytes, stride {self.stride})"
+
+
+if __name__ == "__main__":
+  import mmap
+  import random
+  import tempfile
+  import timeit
+
+  rng = random.Random(0)
+  alphabet = "abc xyz" * 5 + "éñ¼αβ記者鄭🤨"
+  for stride in (1, 3, 16, 1024):
+    text = "".join(rng.choice(alphabet) for _ in range(5000)) + "plain ascii " * 300
+    data = text.encode("utf-8")
+    idx = Utf8Index(data, stride)
+    assert len(idx) == len(text) and idx.indexed == len(data)
+    for i in rng.sample(range(len(text)), 300) + [0, -1, len(text) - 1]:
+      assert idx[i] == text[i]
+      assert idx.byte_offset(i % len(text)) == len(text[:i % len(text)].encode("utf-8"))
+    for s in (slice(10, 400), slice(None, None, 7), slice(900, 100, -3), slice(-50, None), slice(5, 5)):
+      assert idx[s] == text[s], s
+    grown = Utf8Index(b"", stride)
+    pos = 0
+    while pos < len(data):
+      step = rng.randrange(1, 700)
+      grown.append(data[pos:pos + step])
+      pos += step
+      assert len(grown) == len(data[:pos].decode("utf-8", "ignore"))
+    assert grown.offsets == idx.offsets and grown[::-1] == text[::-1]
+    remapped = Utf8Index(data[:777], stride)
+    remapped.refresh(data)
+    assert remapped.offsets == idx.offsets and len(remapped) == len(text)
+  try:
+    Utf8Index(b"ok \xff")
+  except ValueError as e:
+    assert "byte 3" in str(e)
+  else:
+    raise AssertionError("invalid UTF-8 was indexed")
+
+  text = "記者 鄭啟源 羅智堅 résumé El Niño 🤨 shrimp and grits " * 200000
+  with tempfile.TemporaryFile() as f:
+    f.write(text.encode("utf-8"))
+    f.flush()
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+      build = min(timeit.repeat(lambda: Utf8Index(mm), number=1, repeat=3))
+      idx = Utf8Index(mm)
+      picks = [rng.randrange(len(text)) for _ in range(1000)]
+      assert [idx[i] for i in picks] == [text[i] for i in picks]
+      access = min(timeit.repeat(lambda: [idx[i] for i in picks], number=1, repeat=3)) / len(picks)
+      decode = min(timeit.repeat(lambda: mm[:].decode("utf-8")[picks[0]], number=1, repeat=3))
+      print(f"{len(mm) / 1e6:.0f} MB mmap, {len(idx)} chars: index built in {build:.3f}s with "
+            f"{len(idx.offsets)} checkpoints; random char {access * 1e6:.1f} us vs full decode {decode * 1e3:.1f} ms")
@@ -1,2 +1,3 @@
-for i in range(55,11,-1):
-   print(i)
+from genesis.emit_range import emit
+
+emit(55, 11, -1)
@@ -1,4 +1,4 @@
 def make_bitseq(s: str) -> str:
   if not s.isascii():
   	raise ValueError("ASCII only allowed")
-  	return " ".join(f"{ord(i):08b}" for i in s)
\ No newline at end of file
+  return " ".join(f"{ord(i):08b}" for i in s)
\ No newline at end of file
@@ -0,0 +1,14 @@
+import pytest
+
+from genesis import ucd_tables
+
+
+@pytest.fixture(scope="session", autouse=True)
+def ucd_tables_path(tmp_path_factory):
+  # Table lookups build and cache a file on first use; keep the suite out of
+  # the developer's real cache directory.
+  with pytest.MonkeyPatch.context() as mp:
+    mp.setattr(ucd_tables, "TABLES_PATH", str(tmp_path_factory.mktemp("cache") / "ucd_tables.bin"))
+    ucd_tables._tables.cache_clear()
+    yield ucd_tables.TABLES_PATH
+    ucd_tables._tables.cache_clear()
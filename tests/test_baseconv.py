@@ -0,0 +1,29 @@
+from array import array
+
+import pytest
+
+from genesis.baseconv import format_ints, parse_ints
+
+
+@pytest.mark.parametrize("base,digits,empty", [
+  (2, "101", ""), (2, "101", "0b"), (8, "17", ""), (8, "17", "0o"), (10, "99", ""), (16, "1f", ""),
+  (16, "1f", "0x"), (16, "1f", "0X"), (36, "zz", ""),
+])
+def test_empty_entry_is_malformed_in_every_base(base, digits, empty):
+  items, bad = parse_ints([digits, empty], base)
+  assert items == array("Q", [int(digits, base), 0])
+  assert bad == [1]
+
+
+def test_fast_path_matches_int():
+  values = [0, 1, 2 ** 64 - 1, 0xDEADBEEF]
+  for base, spec in ((2, "b"), (16, "x")):
+    assert parse_ints([format(v, spec) for v in values], base) == (array("Q", values), [])
+
+
+def test_overflow_reported():
+  assert parse_ints(["f" * 17, "0x10"], 16) == (array("Q", [0, 16]), [0])
+
+
+def test_format_round_trip():
+  assert parse_ints(format_ints([255, 1], 16, 4, prefix=True), 16) == (array("Q", [255, 1]), [])
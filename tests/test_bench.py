@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from genesis import bench
+from genesis.bench import ENTRIES, KINDS, compare, corpus, run
+
+
+def _result(mb_per_s, peak_kib):
+  return {"mb_per_s": mb_per_s, "peak_kib": peak_kib}
+
+
+def test_corpus_is_deterministic():
+  for kind in KINDS:
+    assert corpus(kind, 500) == corpus(kind, 500) != corpus(kind, 500, seed=1)
+    assert len(corpus(kind, 500)) == 500
+  assert corpus("ascii", 1000).isascii()
+  assert max(corpus("latin1", 1000)) <= "\xff"
+
+
+def test_every_entry_runs_on_its_kinds():
+  results = run(sizes=(64,), min_time=0)["results"]
+  assert sorted(results) == sorted(f"{name}/{kind}/64" for name, entry in ENTRIES.items() for kind in entry.kinds)
+  assert all(r["runs"] >= 5 and r["mb_per_s"] > 0 for r in results.values())
+
+
+def test_compare_flags_throughput_and_memory_only():
+  baseline = {"results": {"a": _result(100, 100), "b": _result(100, 100), "gone": _result(1, 1)}}
+  current = {"results": {"a": _result(89, 100), "b": _result(95, 115), "new": _result(1, 1)}}
+  regressions = compare(current, baseline)
+  assert len(regressions) == 2
+  assert regressions[0].startswith("a: throughput") and regressions[1].startswith("b: peak memory")
+  assert compare(current, baseline, threshold=0.5) == []
+
+
+def test_main_saves_and_checks_baseline(tmp_path, capsys):
+  path = str(tmp_path / "baseline.json")
+  argv = ["--entries", "emit_range", "--sizes", "64", "--min-time", "0", "--baseline", path]
+  bench.main(argv)
+  assert "no baseline" in capsys.readouterr().out
+  bench.main(argv + ["--save-baseline"])
+  with open(path) as f:
+    baseline = json.load(f)
+  assert list(baseline["results"]) == ["emit_range/ascii/64"]
+  baseline["results"]["emit_range/ascii/64"]["mb_per_s"] = float("inf")
+  with open(path, "w") as f:
+    json.dump(baseline, f)
+  with pytest.raises(SystemExit, match="1 regressions"):
+    bench.main(argv)
@@ -0,0 +1,115 @@
+import io
+import random
+
+import pytest
+
+from genesis.bitseq import (bitseq_size, bitseq_to_packed, decode_file, encode_file, iter_bitseq, iter_unbitseq,
+                            make_bitseq, make_bitseq_bulk, make_bitseq_encoded, pack_bits, packed_to_bitseq,
+                            parse_bitseq, unpack_bits)
+
+
+def test_bulk_matches_make_bitseq():
+  text = "What's wrong with ASCII?!?!? "
+  assert make_bitseq_bulk(text) == make_bitseq(text).encode("ascii")
+  assert make_bitseq_bulk(b"") == b"" and make_bitseq("") == ""
+  data = bytes(range(256))
+  assert make_bitseq_bulk(data) == " ".join(f"{b:08b}" for b in data).encode("ascii")
+
+
+def test_bulk_rejects_non_ascii_str():
+  with pytest.raises(ValueError):
+    make_bitseq_bulk("é")
+
+
+def test_bulk_into_buffer():
+  data = b"\x00\xffA"
+  out = bytearray(b"x" * 40)
+  assert make_bitseq_bulk(memoryview(data), out) == bitseq_size(3) == 26
+  assert bytes(out[:26]) == make_bitseq_bulk(data) and out[26:] == b"x" * 14
+  with pytest.raises(ValueError, match="too small"):
+    make_bitseq_bulk(data, bytearray(25))
+
+
+def test_parse_round_trip():
+  data = random.Random(0).randbytes(5000)
+  assert parse_bitseq(make_bitseq_bulk(data)) == data
+  assert parse_bitseq(make_bitseq_bulk(data).decode("ascii")) == data
+  assert parse_bitseq("") == b""
+
+
+@pytest.mark.parametrize("bad", ["0100000", "01000001 ", "0100000101000001", "01000002", "01000001_01000001"])
+def test_parse_rejects_malformed(bad):
+  with pytest.raises(ValueError):
+    parse_bitseq(bad)
+
+
+def test_ascii_matches_make_bitseq():
+  assert make_bitseq_encoded("Hi!") == make_bitseq("Hi!")
+
+
+@pytest.mark.parametrize("group", ["unit", "codepoint"])
+def test_latin1_is_one_group_per_character(group):
+  # 0x80-0xBF are ordinary characters in Latin-1, not UTF-8 continuations.
+  assert make_bitseq_encoded("é¡", "latin-1", group) == "11101001 10100001"
+
+
+def test_utf8_codepoint_groups():
+  assert make_bitseq_encoded("é¡", "utf-8", "codepoint") == "1100001110101001 1100001010100001"
+  assert make_bitseq_encoded("é¡", "utf-8") == "11000011 10101001 11000010 10100001"
+
+
+def test_utf16_codepoint_joins_surrogate_pair():
+  groups = make_bitseq_encoded("é🤨", "utf-16", "codepoint").split()
+  assert [len(g) for g in groups] == [16, 32]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 8, 9, 10, 4096])
+def test_file_round_trip(chunk_size):
+  data = random.Random(1).randbytes(3000)
+  encoded = io.BytesIO()
+  encode_file(io.BytesIO(data), encoded, chunk_size)
+  assert encoded.getvalue() == make_bitseq_bulk(data)
+  decoded = io.BytesIO()
+  decode_file(io.BytesIO(encoded.getvalue()), decoded, chunk_size)
+  assert decoded.getvalue() == data
+
+
+def test_iter_skips_empty_chunks():
+  assert b"".join(iter_bitseq([b"", b"A", b"", b"B"])) == b"01000001 01000010"
+
+
+def test_iter_unbitseq_across_chunk_boundaries():
+  text = make_bitseq_bulk(b"hello")
+  pieces = [text[i:i + 5] for i in range(0, len(text), 5)]
+  assert b"".join(iter_unbitseq(pieces)) == b"hello"
+  with pytest.raises(ValueError, match="truncated"):
+    list(iter_unbitseq([text[:-1]]))
+
+
+@pytest.mark.parametrize("width", range(1, 9))
+def test_pack_matches_brute_force(width):
+  rng = random.Random(width)
+  symbols = bytes(rng.randrange(1 << width) for _ in range(1001))
+  bits = "".join(f"{s:0{width}b}" for s in symbols)
+  bits += "0" * (-len(bits) % 8)
+  packed = pack_bits(symbols, width)
+  assert packed == int(bits, 2).to_bytes(len(bits) // 8, "big")
+  assert unpack_bits(packed, len(symbols), width) == symbols
+
+
+def test_pack_infers_width_and_rejects_overflow():
+  assert pack_bits(b"\x00\x01\x01") == bytes([0b01100000])
+  assert pack_bits(b"") == b""
+  with pytest.raises(ValueError, match="does not fit"):
+    pack_bits(b"\x04", 2)
+  with pytest.raises(ValueError):
+    pack_bits(b"\x01", 9)
+  with pytest.raises(ValueError, match="fewer than"):
+    unpack_bits(b"\x00", 3, 3)
+
+
+def test_bitseq_packed_round_trip():
+  data = b"7-bit ASCII only"
+  packed = bitseq_to_packed(make_bitseq_bulk(data))
+  assert len(packed) == (len(data) * 7 + 7) // 8
+  assert packed_to_bitseq(packed, len(data), 7) == make_bitseq_bulk(data)
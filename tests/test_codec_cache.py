@@ -0,0 +1,81 @@
+import codecs
+import locale
+
+import pytest
+
+from genesis.codec_cache import (canonical, decode_all, decoder, encode_all, encoder, incremental_decoder,
+                                 incremental_encoder, invalidate, lookup, preferred_encoding)
+
+RECORDS = ["記者 鄭啟源", "résumé", "El Niño", "¼ cup", "", "shrimp"]
+
+
+@pytest.fixture(autouse=True)
+def fresh():
+  invalidate()
+  yield
+  invalidate()
+
+
+def test_lookup_is_cached_and_canonical():
+  assert lookup("utf-16") is lookup("utf-16")
+  assert canonical("UTF8") == canonical("utf_8") == "utf-8" and canonical("latin-1") == "iso8859-1"
+  with pytest.raises(LookupError):
+    lookup("no-such-codec")
+
+
+@pytest.mark.parametrize("name", ["utf-8", "UTF8", "utf-16", "utf-32-be", "cp1252", "unicode-escape", "mac-roman"])
+@pytest.mark.parametrize("errors", ["strict", "replace"])
+def test_matches_str_methods(name, errors):
+  records = [s.encode(name, errors).decode(name) for s in RECORDS if errors == "replace" or _encodes(s, name)]
+  encoded = [s.encode(name, errors) for s in records]
+  assert list(map(encoder(name, errors), records)) == encode_all(iter(records), name, errors) == encoded
+  assert list(map(decoder(name, errors), encoded)) == decode_all(iter(encoded), name, errors) == records
+  assert encoder(name, errors) is encoder(name, errors)
+
+
+def _encodes(s, name):
+  try:
+    s.encode(name)
+  except UnicodeEncodeError:
+    return False
+  return True
+
+
+def test_errors_are_honoured():
+  with pytest.raises(UnicodeEncodeError):
+    encoder("cp1252")("記")
+  assert encoder("cp1252", "replace")("記") == b"?"
+  assert decoder("utf-8", "replace")(b"\xff") == "�"
+  with pytest.raises(UnicodeDecodeError):
+    decode_all([b"ok", b"\xff"], "utf-8")
+
+
+def test_incremental():
+  enc = incremental_encoder("utf-16")
+  data = enc.encode("a") + enc.encode("é", True)
+  assert data == "aé".encode("utf-16")
+  dec = incremental_decoder("utf-16")
+  assert "".join(dec.decode(data[i:i + 1]) for i in range(len(data))) + dec.decode(b"", True) == "aé"
+
+
+def test_preferred_encoding_is_snapshotted(monkeypatch):
+  first = preferred_encoding()
+  assert first == codecs.lookup(locale.getpreferredencoding(False)).name
+  monkeypatch.setattr(locale, "getpreferredencoding", lambda do_setlocale=True: "cp1252")
+  assert preferred_encoding() == first
+  invalidate()
+  assert preferred_encoding() == "cp1252"
+
+
+def test_invalidate_picks_up_new_codecs():
+  def search(name):
+    return codecs.lookup("utf-8") if name == "genesis_test_alias" else None
+
+  with pytest.raises(LookupError):
+    lookup("genesis_test_alias")
+  codecs.register(search)
+  try:
+    invalidate()
+    assert canonical("genesis_test_alias") == "utf-8"
+  finally:
+    codecs.unregister(search)
@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from genesis.detect import SAMPLE_SIZE, detect_encoding
+
+
+@pytest.mark.parametrize("data,expected", [
+  (b"\xbc cup of flour", "latin-1"),
+  (b"\x93smart quotes\x94", "cp1252"),
+  ("αβγδ".encode("utf-8"), "utf-8"),
+  ("Help me greet ma".encode("utf-16"), "utf-16"),
+  ("Help me greet ma".encode("utf-16-le"), "utf-16-le"),
+  ("Help me greet ma".encode("utf-32-be"), "utf-32-be"),
+  (b"shrimp and grits", "ascii"),
+])
+def test_detects(data, expected):
+  assert detect_encoding(data).encoding == expected
+  assert detect_encoding(io.BytesIO(data)).encoding == expected
+
+
+def test_seekable_stream_is_rewound():
+  stream = io.BytesIO(b"hello world")
+  assert detect_encoding(stream).encoding == "ascii"
+  assert stream.tell() == 0 and stream.read() == b"hello world"
+
+
+def test_stream_rewinds_to_its_own_position():
+  data = b"x" * 10 + "é".encode("utf-8") * SAMPLE_SIZE
+  stream = io.BytesIO(data)
+  stream.seek(10)
+  assert detect_encoding(stream).encoding == "utf-8"
+  assert stream.read() == data[10:]
+
+
+class Pipe(io.RawIOBase):
+  def __init__(self, data: bytes):
+    self.data = io.BytesIO(data)
+
+  def readable(self) -> bool:
+    return True
+
+  def readinto(self, b) -> int:
+    return self.data.readinto(b)
+
+
+def test_unseekable_stream_keeps_sample_consumed():
+  stream = Pipe(b"abc")
+  assert detect_encoding(stream).encoding == "ascii"
+  assert stream.read() == b""
@@ -0,0 +1,45 @@
+import io
+import random
+
+import pytest
+
+from genesis import emit_range
+from genesis.emit_range import emit, iter_blocks
+
+
+def _expected(*args):
+  return "".join(f"{i}\n" for i in range(*args)).encode("ascii")
+
+
+@pytest.mark.parametrize("args", [
+  (100, 0, -2), (23, 5, -2), (55, 11, -1), (0, 123457, 1), (987654, -5, -5), (5, 200003, 8), (-30, 30, 4),
+  (10 ** 5, 10 ** 5 + 10 ** 4, 1), (200000, 9999, -10000), (3, 250000, 7), (9999, 10001, 1), (10001, 9998, -1),
+  (0, 0, 1), (5, 0, 1), (-20005, 20005, 5),
+])
+def test_matches_range(args):
+  assert b"".join(iter_blocks(*args)) == _expected(*args)
+
+
+def test_small_block(monkeypatch):
+  monkeypatch.setattr(emit_range, "DIGITS", 1)
+  monkeypatch.setattr(emit_range, "BLOCK", 10)
+  emit_range._template.cache_clear()
+  rng = random.Random(0)
+  try:
+    for _ in range(300):
+      step = rng.choice([1, 2, 5, 10, -1, -2, -5, -10, 3, -7])
+      args = (rng.randrange(-50, 400), rng.randrange(-50, 400), step)
+      assert b"".join(iter_blocks(*args)) == _expected(*args), args
+  finally:
+    emit_range._template.cache_clear()
+
+
+def test_emit_writes_and_flushes():
+  out = io.BytesIO()
+  emit(3, 0, -1, out=out)
+  assert out.getvalue() == b"3\n2\n1\n"
+
+
+def test_main_requires_bounds():
+  with pytest.raises(SystemExit):
+    emit_range.main(["5"])
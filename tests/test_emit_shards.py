@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from genesis.emit_shards import emit_to_files, emit_to_mmap, shard_ranges, text_size
+
+
+def _text(r):
+  return "".join(f"{i}\n" for i in r).encode("ascii")
+
+
+def test_text_size_matches_join():
+  for r in (range(0), range(5), range(100, 0, -2), range(-23, 5000, 7), range(10 ** 6, -10 ** 6, -3333),
+            range(-9, 10), range(-10, 11), range(99, 101)):
+    assert text_size(r) == len(_text(r)), r
+  rng = random.Random(0)
+  for _ in range(300):
+    r = range(rng.randrange(-2000, 2000), rng.randrange(-2000, 2000), rng.choice([-13, -3, -1, 1, 2, 9]))
+    assert text_size(r) == len(_text(r)), r
+
+
+@pytest.mark.parametrize("shards", [1, 3, 7, 50])
+def test_shard_ranges_cover_in_order(shards):
+  r = range(40, -3, -3)
+  parts = shard_ranges(r, shards)
+  assert [v for part in parts for v in part] == list(r)
+  assert all(parts) and len(parts) == min(shards, len(r))
+
+
+def test_emit_to_mmap(tmp_path):
+  r = range(250000, -50, -7)
+  path = tmp_path / "out.txt"
+  assert emit_to_mmap(r, str(path), 3, workers=2) == len(_text(r))
+  assert path.read_bytes() == _text(r)
+
+
+def test_emit_to_files(tmp_path):
+  r = range(-5, 30000, 3)
+  paths = emit_to_files(r, str(tmp_path / "shards"), 4, workers=2)
+  assert len(paths) == 4
+  assert b"".join(open(p, "rb").read() for p in paths) == _text(r)
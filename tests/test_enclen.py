@@ -0,0 +1,55 @@
+import pytest
+
+from genesis import enclen
+from genesis.enclen import encoded_length, encoded_lengths
+
+ENCODINGS = ("utf-8", "utf-8-sig", "utf-16", "utf-16-le", "utf-16-be", "utf-32", "utf-32-le", "utf-32-be", "latin-1",
+             "ascii", "cp1252")
+SAMPLES = ("", "bits", "résumé", "El Niño", "ÿ" * 3, "🤨", "記者 鄭啟源 羅智堅", "￿", "αβγδ" * 20000,
+           "shrimp and grits" * 20000)
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_matches_encode(encoding):
+  for s in SAMPLES:
+    try:
+      expected = len(s.encode(encoding))
+    except UnicodeEncodeError:
+      with pytest.raises(UnicodeEncodeError):
+        encoded_length(s, encoding)
+    else:
+      assert encoded_length(s, encoding) == expected, s[:10]
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16", "utf-16-le", "utf-32", "utf-32-be"])
+@pytest.mark.parametrize("s", ["a\ud800", "記\udfff", "🤨\ud83e", "￿\udc00", "é\ud800" * 40000])
+def test_lone_surrogates_are_refused_like_encode(encoding, s):
+  with pytest.raises(UnicodeEncodeError):
+    s.encode(encoding)
+  with pytest.raises(UnicodeEncodeError):
+    encoded_length(s, encoding)
+  with pytest.raises(UnicodeEncodeError):
+    encoded_lengths(["ok", s], encoding)
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16", "utf-32", "latin-1"])
+def test_batch_matches_encode(encoding):
+  records = [s for s in SAMPLES if encoding != "latin-1" or max(s, default="a") < "Ā"]
+  for batch in (records, ["bits", "shrimp and grits"], ["résumé", "ÿ"], iter(records)):
+    batch = list(batch)
+    assert list(encoded_lengths(batch, encoding)) == [len(r.encode(encoding)) for r in batch]
+
+
+def test_window_boundaries(monkeypatch):
+  monkeypatch.setattr(enclen, "WINDOW", 7)
+  s = "🤨記é" * 20
+  for encoding in ("utf-8", "utf-16", "utf-32"):
+    assert encoded_length(s, encoding) == len(s.encode(encoding))
+
+
+@pytest.mark.parametrize("encoding", ["UTF8", "u16", "UTF-16LE", "utf_32_be", "latin1", "utf-8-sig"])
+def test_aliases_resolve_once(encoding):
+  for s in ("résumé", "ab", "ÿ"):
+    assert encoded_length(s, encoding) == len(s.encode(encoding))
+  assert list(encoded_lengths(["résumé", "ab"], encoding)) == [len(s.encode(encoding)) for s in ("résumé", "ab")]
+  assert encoding in enclen._CODECS
@@ -0,0 +1,54 @@
+import io
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from genesis.firstclass_batch import main, process_chunk, read_frames, read_lines, run
+from genesis.firstclass_codec import deobfuscate, obfuscate
+
+MESSAGES = [f"Help me greet ma {i}! @sam 記者".encode("utf-8") for i in range(25)] + [b"", b" "]
+
+
+def _frames(messages):
+  return b"".join(struct.pack(">I", len(m)) + m for m in messages)
+
+
+def test_read_lines_and_frames():
+  assert list(read_lines(io.BytesIO(b"a\nb c\n\nd"))) == [b"a", b"b c", b"", b"d"]
+  assert list(read_frames(io.BytesIO(_frames(MESSAGES)))) == MESSAGES
+
+
+@pytest.mark.parametrize("data, message", [(b"\x00\x00", "length prefix"), (b"\x00\x00\x00\x05abc", "message")])
+def test_read_frames_rejects_truncation(data, message):
+  with pytest.raises(ValueError, match=f"truncated {message}"):
+    list(read_frames(io.BytesIO(data)))
+
+
+@pytest.mark.parametrize("framing", ["lines", "length"])
+def test_process_chunk_matches_per_message(framing):
+  expected = [obfuscate(m.decode("utf-8")).encode("utf-8") for m in MESSAGES]
+  out = process_chunk(MESSAGES, "encode", framing)
+  if framing == "lines":
+    assert out == b"".join(e + b"\n" for e in expected)
+  else:
+    assert out == _frames(expected)
+  assert list(read_frames(io.BytesIO(process_chunk(expected, "decode", "length")))) == MESSAGES
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 1000])
+def test_run_in_process_and_pooled_agree(chunk_size):
+  serial = b"".join(run(MESSAGES, "encode", chunk_size=chunk_size))
+  assert serial == process_chunk(MESSAGES, "encode", "lines")
+  with ThreadPoolExecutor(max_workers=2) as executor:
+    assert b"".join(run(iter(MESSAGES), "encode", chunk_size=chunk_size, executor=executor)) == serial
+  lines = serial.split(b"\n")[:-1]
+  assert [m.decode("utf-8") for m in MESSAGES] == [deobfuscate(l.decode("utf-8")) for l in lines]
+
+
+def test_main_round_trips_files(tmp_path):
+  src = tmp_path / "in.txt"
+  src.write_bytes(b"\n".join(MESSAGES) + b"\n")
+  main(["encode", str(src), str(tmp_path / "enc.txt"), "--workers", "0", "--chunk-size", "3"])
+  main(["decode", str(tmp_path / "enc.txt"), str(tmp_path / "dec.txt"), "--workers", "0"])
+  assert (tmp_path / "dec.txt").read_bytes() == src.read_bytes()
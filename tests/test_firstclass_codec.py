@@ -0,0 +1,47 @@
+import codecs
+import random
+
+import pytest
+
+from genesis.firstclass_codec import NAME, SPACE, deobfuscate, obfuscate
+
+MESSAGES = ("", " ", "Hi! @sam, ok!!", "@b@a!@@!!@ \\", "!!!", "@@ !", "記者 鄭啟源 羅智堅 🤨")
+
+
+def test_wire_format():
+  assert "Help me greet ma".encode(NAME) == "Help me greet ma"[::-1].replace(" ", SPACE).encode("utf-8")
+  assert obfuscate("a b") == f"b{SPACE}a"
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_round_trip(message):
+  assert message.encode(NAME).decode(NAME) == deobfuscate(obfuscate(message)) == message
+  assert message.encode(NAME) == obfuscate(message).encode("utf-8")
+
+
+def test_random_round_trip():
+  rng = random.Random(0)
+  for _ in range(500):
+    message = "".join(rng.choice(" !@ab記🤨") for _ in range(rng.randrange(30)))
+    assert message.encode(NAME).decode(NAME) == message
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_incremental_byte_by_byte(message):
+  encoder = codecs.getincrementalencoder(NAME)()
+  data = b"".join(encoder.encode(c) for c in message) + encoder.encode("", final=True)
+  assert data == message.encode(NAME)
+  decoder = codecs.getincrementaldecoder(NAME)()
+  assert "".join(decoder.decode(data[i:i + 1]) for i in range(len(data))) + decoder.decode(b"", final=True) == message
+
+
+def test_errors_are_passed_through():
+  with pytest.raises(UnicodeDecodeError):
+    b"\xff".decode(NAME)
+  assert b"a\xff".decode(NAME, "replace") == "�a"
+
+
+def test_search_ignores_other_names():
+  assert codecs.lookup(NAME).name == NAME
+  with pytest.raises(LookupError):
+    codecs.lookup("firstclass-nope")
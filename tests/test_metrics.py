@@ -0,0 +1,44 @@
+import io
+
+import pytest
+
+from genesis import baseconv, bitseq, metrics, normalize, transcode
+
+
+@pytest.fixture
+def enabled():
+  metrics.reset()
+  metrics.enable()
+  yield metrics
+  metrics.disable()
+  metrics.reset()
+
+
+def test_transcode_file_counts_file_bytes_not_path(enabled, tmp_path):
+  src = tmp_path / "in.txt"
+  src.write_bytes(b"x" * 6000)
+  transcode.transcode_file(str(src), str(tmp_path / "out.txt"), "utf-8", "utf-16-le")
+  stats = metrics.snapshot()["functions"]["transcode.transcode_file"]
+  assert (stats["bytes_in"], stats["bytes_out"]) == (6000, 12000)
+
+
+def test_file_object_helpers_report_no_sizes(enabled):
+  bitseq.encode_file(io.BytesIO(b"ab"), io.BytesIO())
+  stats = metrics.snapshot()["functions"]["bitseq.encode_file"]
+  assert stats["calls"] == 1 and "bytes_in" not in stats and "bytes_out" not in stats
+  assert 'bytes_in_total{function="bitseq.encode_file"}' not in metrics.prometheus()
+
+
+def test_sequence_payloads_are_summed(enabled):
+  baseconv.parse_ints(["ff", "1"], 16)
+  normalize.normalize_batch(["e\u0301", "abc"])
+  functions = metrics.snapshot()["functions"]
+  assert functions["baseconv.parse_ints"]["bytes_in"] == 3
+  batch = functions["normalize.normalize_batch"]
+  assert (batch["bytes_in"], batch["bytes_out"]) == (5, 4)
+
+
+def test_payload_found_by_keyword(enabled):
+  bitseq.make_bitseq_bulk(data=b"abc")
+  stats = metrics.snapshot()["functions"]["bitseq.make_bitseq_bulk"]
+  assert (stats["bytes_in"], stats["bytes_out"]) == (3, 26)
@@ -0,0 +1,70 @@
+import random
+from array import array
+
+import pytest
+
+from genesis.nbits import n_bits_required, n_bits_required_batch, n_possible_values, n_possible_values_batch
+
+EDGES = [1, 2, 3, 4, 5, 110, 127, 128, 129, 255, 256, 257, 2 ** 53 - 1, 2 ** 53, 2 ** 53 + 1, 2 ** 63, 2 ** 64,
+         2 ** 64 + 1, 2 ** 100 - 1, 2 ** 100]
+
+
+def brute_bits(nvalues: int) -> int:
+  nbits = 0
+  while 2 ** nbits < nvalues:
+    nbits += 1
+  return nbits
+
+
+def samples(seed: int, count: int = 2000) -> list:
+  rng = random.Random(seed)
+  return EDGES + [rng.randrange(1, 2 ** rng.randrange(1, 130)) for _ in range(count)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_n_bits_required_matches_brute_force(seed):
+  for n in samples(seed):
+    nbits = n_bits_required(n)
+    assert nbits == brute_bits(n), n
+    assert n_possible_values(nbits) >= n
+    assert nbits == 0 or n_possible_values(nbits - 1) < n
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_scalar(seed):
+  counts = samples(seed)
+  expected = [brute_bits(n) for n in counts]
+  assert list(n_bits_required_batch(counts)) == expected
+  assert list(n_bits_required_batch(iter(counts))) == expected
+  small = [n for n in counts if n < 2 ** 63]
+  assert list(n_bits_required_batch(array("q", small))) == [brute_bits(n) for n in small]
+
+
+@pytest.mark.parametrize("bad", [0, -1, -2 ** 70])
+def test_rejects_counts_below_one(bad):
+  with pytest.raises(ValueError):
+    n_bits_required(bad)
+  with pytest.raises(ValueError):
+    n_bits_required_batch([5, bad, 7])
+
+
+def test_empty_batch():
+  assert n_bits_required_batch([]) == array("B")
+  assert n_possible_values_batch([]) == array("Q")
+
+
+@pytest.mark.parametrize("typecode", ["b", "B", "h", "H", "i", "I", "l", "L", "q", "Q"])
+def test_possible_values_batch_at_the_overflow_edge(typecode):
+  limit = array(typecode).itemsize * 8 - typecode.islower()
+  widths = list(range(limit))
+  assert list(n_possible_values_batch(widths, typecode)) == [2 ** w for w in widths]
+  for bad in (limit, limit + 1, -1):
+    with pytest.raises(OverflowError, match=rf"widths\[1\] = {bad}"):
+      n_possible_values_batch([0, bad], typecode)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_possible_values_batch_matches_brute_force(seed):
+  rng = random.Random(seed)
+  widths = [rng.randrange(64) for _ in range(1000)]
+  assert list(n_possible_values_batch(widths)) == [2 ** w for w in widths]
@@ -0,0 +1,52 @@
+import random
+import unicodedata
+
+import pytest
+
+from genesis.normalize import FORMS, normalize, normalize_batch
+
+ALPHABET = "aeoAEOkK 한국각̣́̀̈éÅÅÅẛﬁ①ཱི̈́"
+
+
+@pytest.mark.parametrize("form", FORMS)
+def test_matches_unicodedata(form):
+  rng = random.Random(0)
+  for _ in range(1000):
+    s = "".join(rng.choice(ALPHABET) for _ in range(rng.randrange(12)))
+    assert normalize(s, form) == unicodedata.normalize(form, s), s
+  for chunk in (1, 3, 64):
+    s = "".join(rng.choice(ALPHABET) for _ in range(5000))
+    assert normalize(s, form, chunk=chunk) == unicodedata.normalize(form, s), chunk
+
+
+@pytest.mark.parametrize("form", FORMS)
+def test_normalized_text_is_returned_as_is(form):
+  s = unicodedata.normalize(form, "El Niño résumé 記者 " * 1000)
+  assert normalize(s, form, chunk=100) is s
+
+
+def test_batch_counts_changed_records():
+  records = ["El Nin\u0303o", "r\xe9sum\xe9", "\u8a18\u8005", "e\u0301"] * 10
+  out, changed = normalize_batch(iter(records))
+  assert out == [unicodedata.normalize("NFC", r) for r in records] and changed == 20
+  assert all(a is b for a, b in zip(out[1::4], records[1::4]))
+  assert normalize_batch([], "NFKD") == ([], 0)
+
+
+def test_rejects_unknown_form():
+  for call in (lambda: normalize("a", "NFX"), lambda: normalize_batch(["a"], "nfc")):
+    with pytest.raises(ValueError, match="invalid normalization form"):
+      call()
+
+
+@pytest.mark.parametrize("form", ["NFC", "NFKC"])
+def test_maybe_but_normalized_input_is_not_copied(form):
+  # A nukta answers "Maybe" to the NFC quick check, so unicodedata hands
+  # back an equal copy rather than the argument itself.
+  record = unicodedata.normalize(form, "ज़रूर")
+  assert unicodedata.normalize(form, record) is not record
+  assert normalize(record, form) is record
+  text = (record + " ") * 2000
+  assert normalize(text, form, chunk=100) is text
+  out, changed = normalize_batch([record, "e\u0301", record], form)
+  assert out[0] is record and out[2] is record and changed == 1
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+import pytest
+
+import genesis
+from genesis.importtime import MODULES
+
+
+def test_exports_resolve():
+  for name in genesis.__all__:
+    assert getattr(genesis, name) is not None, name
+
+
+def test_bitseq_file_helpers_exported_in_pairs():
+  assert genesis.encode_file.__module__ == genesis.decode_file.__module__ == "genesis.bitseq"
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_stays_light(module):
+  # Annotations use builtin generics and collections.abc; typing, re and the
+  # process pool machinery load only when a code path needs them.
+  heavy = ("typing", "re", "concurrent.futures", "argparse", "platform", "contextlib")
+  code = f"import sys, {module}; print(' '.join(m for m in {heavy!r} if m in sys.modules))"
+  out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+  assert out.split() == []
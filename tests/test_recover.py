@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from genesis.recover import RecoveringDecoder, Repair, decode_chunks, decode_file
+
+GOOD = "記者 鄭啟源 αβγδ 🤨 ".encode("utf-8")
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 4093])
+def test_clean_input_matches_decode(size):
+  data = GOOD * 50
+  repairs = []
+  assert "".join(decode_chunks([data[i:i + size] for i in range(0, len(data), size)], repairs=repairs)) == \
+    data.decode("utf-8")
+  assert repairs == []
+
+
+@pytest.mark.parametrize("size", [1, 5, 4093])
+def test_bad_bytes_fall_back_with_offsets(size):
+  data = GOOD * 20 + b"\xbc cup of flour " + GOOD + b"\xf0\x9f"
+  repairs = []
+  text = "".join(decode_chunks((data[i:i + size] for i in range(0, len(data), size)), repairs=repairs))
+  assert text == data.decode("utf-8", "replace").replace("�", "¼", 1)[:-1] + "ð\x9f"
+  assert [(r.start, r.end) for r in repairs] == [(len(GOOD) * 20, len(GOOD) * 20 + 1), (len(data) - 2, len(data))]
+  assert repairs[0] == Repair(len(GOOD) * 20, len(GOOD) * 20 + 1, "¼")
+
+
+def test_decoder_final_flushes_truncated_sequence():
+  decoder = RecoveringDecoder(fallback="cp1252")
+  assert decoder.decode(b"ok \xe2\x80") == "ok "
+  assert decoder.decode(b"", final=True) == "â€"
+  assert [(r.start, r.end) for r in decoder.repairs] == [(3, 5)]
+
+
+def test_decode_file():
+  assert "".join(decode_file(io.BytesIO(b"\x93quoted\x94"), fallback="cp1252", chunk_size=3)) == "“quoted”"
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from genesis.seqview import EVEN_NUMS, ONE_TO_TEN, ODD_NO, ArithmeticSequence
+
+
+def test_matches_range_randomly():
+  rng = random.Random(0)
+  for _ in range(1000):
+    args = rng.randrange(-50, 50), rng.randrange(-50, 50), rng.choice([-7, -2, -1, 1, 2, 3, 10])
+    r, seq = range(*args), ArithmeticSequence(*args)
+    assert list(seq) == list(r) and len(seq) == len(r) and seq == r and hash(seq) == hash(ArithmeticSequence(*args))
+    assert list(reversed(seq)) == list(reversed(r))
+    s = slice(rng.choice([None, -3, 2, 40]), rng.choice([None, -1, 5, 60]), rng.choice([None, -2, 1, 3]))
+    assert list(seq[s]) == list(r[s]) and seq[s] == r[s]
+    assert list(seq.evens()) == [v for v in r if v % 2 == 0]
+    assert list(seq.odds()) == [v for v in r if v % 2]
+    for v in range(-60, 60, 7):
+      assert (v in seq) == (v in r)
+
+
+def test_constants():
+  assert list(EVEN_NUMS) == list(range(100, 0, -2))
+  assert list(ODD_NO) == list(range(23, 5, -2))
+  assert list(ONE_TO_TEN) == list(range(55, 11, -1))
+  assert EVEN_NUMS.to_array().tolist() == list(EVEN_NUMS)
+
+
+def test_indexing_and_lookup():
+  seq = ArithmeticSequence(10)
+  assert seq[-1] == 9 and seq.index(4) == 4 and seq.count(4) == 1 and seq.count(4.5) == 0
+  assert 3.0 in seq and "3" not in seq
+  with pytest.raises(IndexError):
+    seq[10]
+  with pytest.raises(ValueError):
+    seq.index(4, 5)
+  with pytest.raises(ValueError):
+    ArithmeticSequence(0, 10, 0)
+
+
+def test_beyond_maxsize():
+  huge = ArithmeticSequence(10 ** 30, 0, -3)
+  assert huge.length == (10 ** 30 + 2) // 3 and huge[-1] == 1
+  assert 10 ** 30 - 3 * 10 ** 20 in huge and 10 ** 30 - 1 not in huge
+  assert list(huge.odds()[:3]) == [10 ** 30 - 3, 10 ** 30 - 9, 10 ** 30 - 15]
+  assert huge[::-1][:2] == range(1, 5, 3)
+  with pytest.raises(OverflowError):
+    len(huge)
+
+
+def test_empty_sequences_are_equal():
+  assert ArithmeticSequence(5, 0) == ArithmeticSequence(0, -5, 3) == range(0)
+  assert hash(ArithmeticSequence(5, 0)) == hash(ArithmeticSequence(1, 1, 7))
+  assert ArithmeticSequence(5, 0).reversed().length == 0
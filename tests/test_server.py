@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from genesis import bitseq
+from genesis.client import Client, RemoteError
+from genesis.server import _FRAME, _HEAD, _LENGTH, DATA, END, ERROR, Server
+from genesis.uchr import UchrError
+
+TEXT = "記者 鄭啟源 羅智堅 résumé El Niño 🤨 " * 3000
+PAYLOAD = TEXT.encode("utf-8")
+
+
+def _run(check, path=None, **kwargs):
+  async def main():
+    server = await Server(path, port=0, **kwargs).start()
+    try:
+      async with Client(path, server.host, server.port, size=2) as client:
+        await check(server, client)
+    finally:
+      await server.close()
+
+  asyncio.run(main())
+
+
+@pytest.mark.parametrize("unix", [False, True])
+def test_ops_round_trip(tmp_path, unix):
+  async def check(server, client):
+    assert await client.transcode(PAYLOAD, "utf-8", "utf-16-le") == TEXT.encode("utf-16-le")
+    pieces = [PAYLOAD[i:i + 1000] for i in range(0, len(PAYLOAD), 1000)]
+    assert await client.transcode(pieces, "utf-8", "utf-32-be") == TEXT.encode("utf-32-be")
+    assert (await client.detect(TEXT.encode("utf-16-le"))).encoding == "utf-16-le"
+    assert await client.bitseq(PAYLOAD) == bitseq.make_bitseq_bulk(PAYLOAD)
+    assert await client.parse_uchr("U+0041 U+D800 U+1F928") == (
+      "A🤨", [UchrError(1, 8, "U+D800", "surrogate code point")])
+
+  _run(check, str(tmp_path / "genesis.sock") if unix else None, workers=0)
+
+
+def test_async_payload_and_offload():
+  async def pieces():
+    for i in range(0, len(PAYLOAD), 5000):
+      yield PAYLOAD[i:i + 5000]
+
+  async def check(server, client):
+    assert await client.bitseq(pieces()) == bitseq.make_bitseq_bulk(PAYLOAD)
+    assert await client.transcode(pieces(), dst="utf-16") == TEXT.encode("utf-16")
+
+  with ThreadPoolExecutor(max_workers=2) as executor:
+    _run(check, executor=executor)
+
+
+def test_errors_leave_connection_usable():
+  async def check(server, client):
+    with pytest.raises(RemoteError, match="UnicodeDecodeError"):
+      await client.transcode([b"ok", b"\xff", b"more"], "utf-8")
+    with pytest.raises(RemoteError, match="LookupError"):
+      await client.transcode(b"x", dst="no-such-codec")
+    with pytest.raises(RemoteError, match="TypeError"):
+      await client.request("detect", b"x", bogus=1)
+    assert len(client._idle) == 1
+    assert await client.transcode(b"x") == b"x"
+    results = await asyncio.gather(*(client.transcode(b"x" * n, dst="utf-16-be") for n in range(20)))
+    assert results == ["x".encode("utf-16-be") * n for n in range(20)]
+    assert len(client._idle) <= 2
+
+  _run(check, workers=0)
+
+
+def test_unknown_op_is_an_error_frame():
+  async def check(server, client):
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    for op in (99, 0):
+      writer.write(_HEAD.pack(op, 0) + _LENGTH.pack(1) + b"x" + _LENGTH.pack(0))
+      frames = []
+      while not frames or frames[-1][0] not in (END, ERROR):
+        kind, n = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+        frames.append((kind, await reader.readexactly(n)))
+      assert frames == ([(ERROR, b"ValueError: unknown op 99")] if op else [(DATA, b"x"), (END, b"")])
+    writer.close()
+
+  _run(check, workers=0)
+
+
+def test_load_generator_reports_no_errors():
+  from genesis.loadtest import load
+
+  async def check(server, client):
+    stats = await load(client, ["transcode", "detect", "bitseq", "uchr"], 2000, 4, 0.2)
+    assert stats["errors"] == 0 and stats["requests"] >= 4 and stats["p50_ms"] <= stats["max_ms"]
+
+  _run(check, workers=0)
@@ -0,0 +1,30 @@
+import pytest
+
+from genesis.transcode import ENCODINGS, transcode_file, transcoded_size
+
+TEXT = "記者 鄭啟源 résumé El Niño 🤨 shrimp and grits\n" * 50
+
+
+@pytest.mark.parametrize("src", ENCODINGS)
+@pytest.mark.parametrize("dst", ENCODINGS)
+def test_round_trip(tmp_path, src, dst):
+  path = tmp_path / "in"
+  path.write_bytes(TEXT.encode(src))
+  assert transcoded_size(path.read_bytes(), src, dst) == len(TEXT.encode(dst))
+  size = transcode_file(str(path), str(tmp_path / "out"), src, dst, window=64)
+  assert (tmp_path / "out").read_bytes() == TEXT.encode(dst) and size == len(TEXT.encode(dst))
+
+
+def test_invalid_input_leaves_no_output(tmp_path):
+  path = tmp_path / "in"
+  path.write_bytes(b"abc\xffdef")
+  with pytest.raises(UnicodeDecodeError):
+    transcode_file(str(path), str(tmp_path / "out"), "utf-8", "utf-16-le")
+  assert not (tmp_path / "out").exists()
+
+
+def test_missing_source_keeps_existing_output(tmp_path):
+  (tmp_path / "out").write_bytes(b"keep")
+  with pytest.raises(FileNotFoundError):
+    transcode_file(str(tmp_path / "missing"), str(tmp_path / "out"), "utf-8", "utf-16-le")
+  assert (tmp_path / "out").read_bytes() == b"keep"
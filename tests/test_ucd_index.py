@@ -0,0 +1,43 @@
+import sys
+import unicodedata
+
+import pytest
+
+from genesis.ucd_index import category, get_index, lookup, name
+
+
+@pytest.fixture(scope="module")
+def index():
+  return get_index()
+
+
+def test_lookup(index):
+  assert index.lookup("EURO SIGN") == "€" == index.lookup("euro sign")
+  assert index.lookup("NO SUCH CHARACTER") is None
+  assert index.lookup("") is None
+
+
+def test_prefix(index):
+  alphas = index.prefix("GREEK SMALL LETTER ALPHA")
+  assert alphas[0] == "α" and all(unicodedata.name(ch).startswith("GREEK SMALL LETTER ALPHA") for ch in alphas)
+  assert index.prefix("GREEK SMALL LETTER", limit=3) == index.prefix("GREEK SMALL LETTER")[:3]
+  assert index.prefix("ZZZZ") == []
+
+
+def test_search_matches_full_scan(index):
+  expected = sorted(chr(cp) for cp in range(sys.maxunicode + 1) if "SNOWMAN" in unicodedata.name(chr(cp), ""))
+  assert sorted(index.search("snowman")) == expected
+  assert len(index.search("LATIN", limit=5)) == 5
+  assert index.search("") == [] and index.search("A\nB") == []
+
+
+def test_by_category(index):
+  assert "A" in map(chr, index.by_category("Lu"))
+  assert len(index.by_category("Xx")) == 0
+
+
+def test_cached_wrappers():
+  assert name("€") == "EURO SIGN" and lookup("EURO SIGN") == "€" and category("€") == "Sc"
+  assert name("\x00") is None and name("\x00", "?") == "?"
+  with pytest.raises(KeyError):
+    lookup("NO SUCH CHARACTER")
@@ -0,0 +1,75 @@
+import mmap
+import os
+import random
+import unicodedata
+
+import pytest
+
+from genesis import ucd_tables
+
+
+@pytest.fixture(scope="module")
+def built():
+  return ucd_tables.build_tables()
+
+
+@pytest.fixture
+def tracked(monkeypatch):
+  maps = []
+
+  class Tracked(mmap.mmap):
+    def __init__(self, *args, **kwargs):
+      maps.append(self)
+
+  monkeypatch.setattr(ucd_tables.mmap, "mmap", Tracked)
+  return maps
+
+
+def test_cache_dir_is_not_the_package(monkeypatch, tmp_path):
+  monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+  monkeypatch.delenv("LOCALAPPDATA", raising=False)
+  assert ucd_tables._cache_dir() == os.path.join(str(tmp_path), "genesis")
+  monkeypatch.delenv("XDG_CACHE_HOME")
+  monkeypatch.setenv("HOME", str(tmp_path / "home"))
+  assert ucd_tables._cache_dir() == os.path.join(str(tmp_path), "home", ".cache", "genesis")
+
+
+def test_default_path_is_read_per_call(monkeypatch, tmp_path, built):
+  monkeypatch.setattr(ucd_tables, "build_tables", lambda: built)
+  monkeypatch.setattr(ucd_tables, "TABLES_PATH", str(tmp_path / "tables.bin"))
+  ucd_tables.load_tables()
+  assert (tmp_path / "tables.bin").read_bytes() == built
+
+
+def test_builds_into_missing_directory_then_maps(monkeypatch, tmp_path, built):
+  monkeypatch.setattr(ucd_tables, "build_tables", lambda: built)
+  path = str(tmp_path / "a" / "b" / "tables.bin")
+  stage1, stage2 = ucd_tables.load_tables(path)
+  with open(path, "rb") as f:
+    assert f.read() == built
+  assert (bytes(stage1), bytes(stage2)) == tuple(map(bytes, ucd_tables.load_tables(path)))
+
+
+def test_stale_file_is_closed_and_replaced(monkeypatch, tmp_path, built, tracked):
+  monkeypatch.setattr(ucd_tables, "build_tables", lambda: built)
+  path = tmp_path / "tables.bin"
+  path.write_bytes(b"UCDT" + bytes(ucd_tables._HEADER.size))
+  ucd_tables.load_tables(str(path))
+  assert len(tracked) == 1 and tracked[0].closed
+  assert path.read_bytes() == built
+  assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_unwritable_location_still_loads(monkeypatch, tmp_path, built):
+  monkeypatch.setattr(ucd_tables, "build_tables", lambda: built)
+  blocker = tmp_path / "file"
+  blocker.write_bytes(b"")
+  stage1, stage2 = ucd_tables.load_tables(str(blocker / "tables.bin"))
+  assert len(stage1) == 0x11 * 256 and len(stage2) % 256 == 0
+
+
+def test_lookups_match_unicodedata():
+  rng = random.Random(0)
+  sample = "".join(chr(rng.randrange(0x110000)) for _ in range(5000))
+  assert ucd_tables.categories(sample) == [unicodedata.category(ch) for ch in sample]
+  assert ucd_tables.east_asian_widths(sample) == [unicodedata.east_asian_width(ch) for ch in sample]
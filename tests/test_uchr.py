@@ -0,0 +1,65 @@
+import io
+import mmap
+import random
+from array import array
+
+import pytest
+
+from genesis import uchr
+from genesis.uchr import UchrError, make_uchr, parse_uchr, parse_uchr_codepoints
+
+
+@pytest.fixture(scope="module")
+def codes():
+  rng = random.Random(0)
+  return [f"U+{rng.randrange(0x20, 0xD000):04X}" for _ in range(2000)]
+
+
+def test_matches_make_uchr(codes):
+  expected = "".join(map(make_uchr, codes))
+  for source in ("\n".join(codes), ", ".join(codes), "; ".join(codes).encode("ascii"),
+                 io.StringIO("\n".join(codes)), io.BytesIO(" ".join(codes).encode("ascii")), [" ".join(codes)]):
+    assert parse_uchr(source) == (expected, [])
+
+
+def test_ranges_and_supplementary():
+  assert parse_uchr("U+0041..U+005A U+10346")[0] == "ABCDEFGHIJKLMNOPQRSTUVWXYZ\U00010346"
+  assert parse_uchr_codepoints("U+61 U+10FFFF") == (array("I", [0x61, 0x10FFFF]), [])
+  assert parse_uchr("u+61 U+62") == ("b", [UchrError(1, 1, "u+61", "malformed token")])
+
+
+def test_errors_are_positioned():
+  text, errors = parse_uchr("U+0041 U+D800\nU+110000 U+0042..U+0041 x41")
+  assert text == "A"
+  assert errors == [
+    UchrError(1, 8, "U+D800", "surrogate code point"),
+    UchrError(2, 1, "U+110000", "code point above U+10FFFF"),
+    UchrError(2, 10, "U+0042..U+0041", "range end before range start"),
+    UchrError(2, 25, "x41", "malformed token"),
+  ]
+
+
+def test_empty():
+  assert parse_uchr("") == ("", [])
+
+
+def test_non_ascii_digits_are_malformed_on_both_paths():
+  assert parse_uchr("U+٤١") == ("", [UchrError(1, 1, "U+٤١", "malformed token")])
+  assert parse_uchr("U+٤١..U+42")[1][0].message == "malformed token"
+
+
+def test_files_are_read_and_maps_closed(tmp_path, monkeypatch):
+  path = tmp_path / "codes.txt"
+  path.write_text("U+0041 é U+0042", encoding="utf-8")
+  with open(path, encoding="utf-8") as f:
+    assert parse_uchr(f) == ("AB", [UchrError(1, 8, "é", "malformed token")])
+  maps = []
+
+  class Tracked(mmap.mmap):
+    def __init__(self, *args, **kwargs):
+      maps.append(self)
+
+  monkeypatch.setattr(uchr.mmap, "mmap", Tracked)
+  with open(path, "rb") as f:
+    assert parse_uchr(f) == ("AB", [UchrError(1, 8, "Ã©", "malformed token")])
+  assert len(maps) == 1 and maps[0].closed
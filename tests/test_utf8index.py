@@ -0,0 +1,95 @@
+import mmap
+import random
+
+import pytest
+
+from genesis import utf8index
+from genesis.utf8index import Utf8Index
+
+ALPHABET = "abc xyz" * 5 + "éñ¼αβ記者鄭🤨"
+
+
+def _text(seed, n=3000):
+  rng = random.Random(seed)
+  return "".join(rng.choice(ALPHABET) for _ in range(n)) + "plain ascii " * 200
+
+
+@pytest.mark.parametrize("stride", [1, 3, 16, 1024])
+def test_indexing_matches_str(stride):
+  text = _text(stride)
+  data = text.encode("utf-8")
+  idx = Utf8Index(data, stride)
+  assert len(idx) == len(text) and idx.indexed == len(data)
+  for i in range(-len(text), len(text), 7):
+    assert idx[i] == text[i]
+  for i in range(0, len(text) + 1, 11):
+    assert idx.byte_offset(i) == len(text[:i].encode("utf-8"))
+  for s in (slice(10, 400), slice(None, None, 7), slice(900, 100, -3), slice(-50, None), slice(5, 5), slice(None)):
+    assert idx[s] == text[s], s
+
+
+def test_small_blocks(monkeypatch):
+  monkeypatch.setattr(utf8index, "BLOCK", 5)
+  text = _text(0, 500)
+  idx = Utf8Index(text.encode("utf-8"), 4)
+  assert idx[:] == text and [idx[i] for i in range(len(text))] == list(text)
+
+
+@pytest.mark.parametrize("stride", [1, 5, 1024])
+def test_append_holds_back_split_characters(stride):
+  text = _text(stride + 1)
+  data = text.encode("utf-8")
+  rng = random.Random(stride)
+  grown = Utf8Index(b"", stride)
+  pos = 0
+  while pos < len(data):
+    step = rng.randrange(1, 300)
+    grown.append(data[pos:pos + step])
+    pos += step
+    assert len(grown) == len(data[:pos].decode("utf-8", "ignore"))
+  assert grown.offsets == Utf8Index(data, stride).offsets and grown[::-1] == text[::-1]
+
+
+def test_refresh_and_mmap(tmp_path):
+  text = _text(5)
+  data = text.encode("utf-8")
+  path = tmp_path / "text"
+  path.write_bytes(data[:777])
+  with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    idx = Utf8Index(mm, 16)
+    assert idx[:] == data[:777].decode("utf-8", "ignore")
+  path.write_bytes(data)
+  with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    idx.refresh(mm)
+    assert len(idx) == len(text) and idx[len(text) // 2] == text[len(text) // 2]
+    assert idx.offsets == Utf8Index(data, 16).offsets
+
+
+def test_errors():
+  with pytest.raises(ValueError, match="byte 3"):
+    Utf8Index(b"ok \xff")
+  with pytest.raises(ValueError, match="stride"):
+    Utf8Index(b"", 0)
+  idx = Utf8Index("é".encode("utf-8"))
+  with pytest.raises(IndexError):
+    idx[1]
+  with pytest.raises(IndexError):
+    idx.byte_offset(2)
+  assert idx.byte_offset(1) == 2 and Utf8Index()[:] == ""
+
+
+@pytest.mark.parametrize("stride", [1, 4])
+def test_invalid_append_spanning_blocks_leaves_index_intact(monkeypatch, stride):
+  monkeypatch.setattr(utf8index, "BLOCK", 8)
+  idx = Utf8Index("é".encode("utf-8"), stride)
+  before = (idx.length, idx.indexed, list(idx.offsets), bytes(idx.data))
+  with pytest.raises(ValueError, match="byte 32"):
+    idx.append(b"abcdefghij" * 3 + b"\xff")
+  assert (idx.length, idx.indexed, list(idx.offsets), bytes(idx.data)) == before
+  idx.append("xyz€".encode("utf-8"))
+  assert idx[:] == "éxyz€" and idx.offsets == Utf8Index("éxyz€".encode("utf-8"), stride).offsets
+  with pytest.raises(ValueError):
+    idx.refresh(bytes(idx.data) + b"\x80" * 20)
+  assert idx[:] == "éxyz€"
+  idx.refresh(bytes(idx.data) + b"ok")
+  assert idx[:] == "éxyz€ok"